@@ -7,7 +7,8 @@ particularly for navigating from ranking tables to municipality profiles.
 
 import streamlit as st
 import pandas as pd
-from typing import Optional, List, Dict, Any
+import polars as pl
+from typing import Optional, List, Dict, Any, Union
 
 
 def navigate_to_municipality(id_municipio: str, nome_municipio: str = "") -> None:
@@ -50,7 +51,7 @@ def clear_navigation_state() -> None:
 
 
 def render_clickable_ranking_table(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, pl.DataFrame],
     display_columns: List[str],
     column_config: Dict[str, Any],
     id_column: str = "id_municipio",
@@ -65,7 +66,7 @@ def render_clickable_ranking_table(
     navigate to the municipality profile page.
 
     Args:
-        df: DataFrame with ranking data.
+        df: pandas or Polars DataFrame with ranking data.
         display_columns: List of columns to display.
         column_config: Streamlit column configuration dict.
         id_column: Column name containing municipality IDs.
@@ -79,12 +80,9 @@ def render_clickable_ranking_table(
         st.dataframe(df[display_columns], use_container_width=True, hide_index=True)
         return
 
-    # Create selection dataframe with all necessary columns
-    selection_df = df.copy()
-
     # Display the dataframe with selection enabled
     event = st.dataframe(
-        selection_df[display_columns],
+        df[display_columns],
         use_container_width=True,
         hide_index=True,
         height=height,
@@ -97,8 +95,12 @@ def render_clickable_ranking_table(
     # Handle row selection
     if event and event.selection and event.selection.rows:
         selected_row_idx = event.selection.rows[0]
-        selected_id = str(selection_df.iloc[selected_row_idx][id_column])
-        selected_name = str(selection_df.iloc[selected_row_idx].get(name_column, ""))
+        if isinstance(df, pl.DataFrame):
+            selected_row = df.row(selected_row_idx, named=True)
+        else:
+            selected_row = df.iloc[selected_row_idx]
+        selected_id = str(selected_row[id_column])
+        selected_name = str(selected_row.get(name_column, ""))
 
         # Navigate to municipality profile
         navigate_to_municipality(selected_id, selected_name)
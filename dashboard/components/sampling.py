@@ -0,0 +1,35 @@
+"""
+Sampling utilities for the Municipios Analytics dashboard.
+
+Keeps large scatter plots responsive by limiting the points sent to the browser.
+"""
+
+from typing import Optional
+
+import polars as pl
+
+
+def stratified_sample(df: pl.DataFrame, by: Optional[str], max_points: int) -> pl.DataFrame:
+    """
+    Sample roughly max_points rows, keeping each group's share of the data.
+
+    Every group keeps the same fraction of its rows (rounded up, so small
+    groups never disappear). The shuffle is seeded, so the same input always
+    yields the same sample and plots don't jitter between reruns.
+
+    Args:
+        df: Data to sample.
+        by: Column whose groups are sampled proportionally, or None for a
+            plain random sample.
+        max_points: Target number of rows; df is returned unchanged if it
+            is not larger.
+
+    Returns:
+        The sampled DataFrame.
+    """
+    if df.height <= max_points:
+        return df
+
+    fraction = max_points / df.height
+    keep = pl.int_range(pl.len()).shuffle(seed=0) < (pl.len() * fraction).ceil()
+    return df.filter(keep.over(by) if by else keep)
@@ -7,7 +7,9 @@ socio-economic indicators across Brazilian municipalities.
 
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
+import polars as pl
 
 st.set_page_config(
     page_title="Correlações - Brazil Analytics",
@@ -20,6 +22,7 @@ from dashboard.data.queries import (
     get_regions,
     WAREHOUSE_PATH,
 )
+from dashboard.components.sampling import stratified_sample
 
 # Available indicators
 INDICATORS = {
@@ -34,6 +37,9 @@ INDICATORS = {
     "População": "populacao",
 }
 
+# Scatter points sent to the browser unless the user asks for all of them
+MAX_SCATTER_POINTS = 1500
+
 # Preset correlations of interest
 PRESETS = {
     "IDHM × Gini (Desigualdade)": ("idhm_2010", "gini_2010"),
@@ -46,30 +52,29 @@ PRESETS = {
 }
 
 
-def calculate_correlation(x: list, y: list) -> float:
-    """Calculate Pearson correlation coefficient."""
-    x_arr = np.array([v for v in x if v is not None])
-    y_arr = np.array([v for v in y if v is not None])
-
-    if len(x_arr) < 2 or len(y_arr) < 2:
-        return 0.0
-
-    # Filter to same length
-    min_len = min(len(x_arr), len(y_arr))
-    x_arr = x_arr[:min_len]
-    y_arr = y_arr[:min_len]
-
-    # Calculate correlation
-    x_mean = np.mean(x_arr)
-    y_mean = np.mean(y_arr)
-
-    numerator = np.sum((x_arr - x_mean) * (y_arr - y_mean))
-    denominator = np.sqrt(np.sum((x_arr - x_mean) ** 2) * np.sum((y_arr - y_mean) ** 2))
-
-    if denominator == 0:
-        return 0.0
-
-    return numerator / denominator
+def calculate_regression(df: pl.DataFrame, by: str | None = None) -> pl.DataFrame:
+    """
+    Calculate Pearson correlation and OLS fit of y_value on x_value.
+
+    All statistics come from a single aggregation over the rows where both
+    values are present, optionally grouped by a column.
+    """
+    stats = [
+        pl.corr("x_value", "y_value").alias("r"),
+        (pl.cov("x_value", "y_value") / pl.col("x_value").var()).alias("slope"),
+        pl.col("x_value").mean().alias("x_mean"),
+        pl.col("y_value").mean().alias("y_mean"),
+        pl.col("x_value").min().alias("x_min"),
+        pl.col("x_value").max().alias("x_max"),
+        pl.len().alias("n"),
+    ]
+
+    pairs = df.drop_nulls(["x_value", "y_value"])
+    result = pairs.group_by(by).agg(stats) if by else pairs.select(stats)
+
+    return result.with_columns(
+        (pl.col("y_mean") - pl.col("slope") * pl.col("x_mean")).alias("intercept")
+    )
 
 
 def interpret_correlation(r: float) -> tuple[str, str]:
@@ -163,6 +168,12 @@ def main() -> None:
         value=False,
     )
 
+    show_all_points = st.sidebar.checkbox(
+        "Mostrar todos os pontos",
+        value=False,
+        help=f"Por padrão o gráfico exibe uma amostra de até {MAX_SCATTER_POINTS:,} municípios",
+    )
+
     # Load data
     try:
         df = get_correlation_data(x_indicator, y_indicator)
@@ -183,9 +194,9 @@ def main() -> None:
         return
 
     # Calculate correlation
-    x_values = df["x_value"].to_list()
-    y_values = df["y_value"].to_list()
-    correlation = calculate_correlation(x_values, y_values)
+    correlation = calculate_regression(df)["r"][0]
+    if correlation is None or not np.isfinite(correlation):
+        correlation = 0.0
     interpretation, interp_color = interpret_correlation(correlation)
 
     # Display correlation info
@@ -232,9 +243,12 @@ def main() -> None:
 
     size_col = "populacao" if size_by_pop else None
 
+    # Stratified sample for the scatter (statistics and trend lines use all rows)
+    scatter_df = df if show_all_points else stratified_sample(df, color_col, MAX_SCATTER_POINTS)
+
     # Create scatter plot
     fig = px.scatter(
-        plot_df,
+        scatter_df.to_pandas(),
         x="x_value",
         y="y_value",
         color=color_col,
@@ -262,9 +276,24 @@ def main() -> None:
             "Sul": "#9b59b6",
             "Centro-Oeste": "#f39c12",
         } if color_col == "regiao" else None,
-        trendline="ols",  # Add trend line
     )
 
+    # Add trend lines (one per color group, fitted on the full data)
+    trace_colors = {trace.name: trace.marker.color for trace in fig.data}
+    for row in calculate_regression(df, by=color_col).iter_rows(named=True):
+        slope = row["slope"]
+        if slope is None or not np.isfinite(slope):
+            continue
+        x_line = [row["x_min"], row["x_max"]]
+        fig.add_trace(go.Scatter(
+            x=x_line,
+            y=[row["intercept"] + slope * x for x in x_line],
+            mode="lines",
+            line=dict(color=trace_colors.get(str(row[color_col])) if color_col else "#555"),
+            showlegend=False,
+            hoverinfo="skip",
+        ))
+
     fig.update_layout(
         height=600,
         margin=dict(l=20, r=20, t=40, b=20),
@@ -287,6 +316,12 @@ def main() -> None:
 
     st.plotly_chart(fig, use_container_width=True)
 
+    if scatter_df.height < df.height:
+        st.caption(
+            f"Exibindo amostra de {scatter_df.height:,} de {df.height:,} municípios "
+            "(estratificada pela cor). Correlação e linhas de tendência usam todos os dados."
+        )
+
     st.markdown("---")
 
     # Summary statistics
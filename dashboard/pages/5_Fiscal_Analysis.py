@@ -389,14 +389,18 @@ try:
 
         st.plotly_chart(fig, use_container_width=True)
 
-        # Summary table
+        # Summary table (Polars frame goes straight to Streamlit's Arrow path)
         st.markdown("**Resumo por Regiao:**")
         st.dataframe(
-            df[["regiao", "num_municipios", "avg_transfers_per_capita", "avg_fpm_share", "avg_fundeb_share", "avg_sus_share"]],
+            transfer_data.select([
+                "regiao", "num_municipios", "avg_transfers_per_capita",
+                "avg_fpm_share", "avg_fundeb_share", "avg_sus_share"
+            ]),
             use_container_width=True,
             hide_index=True,
+            height=min(600, 35 + 35 * transfer_data.height),
             column_config={
-                "regiao": "Regiao",
+                "regiao": st.column_config.TextColumn("Regiao"),
                 "num_municipios": "Municipios",
                 "avg_transfers_per_capita": st.column_config.NumberColumn("Transf. per Capita (R$)", format="R$ %.2f"),
                 "avg_fpm_share": st.column_config.NumberColumn("FPM %", format="%.1f"),
@@ -5,11 +5,17 @@ Interactive maps showing fiscal metrics at state and regional levels.
 Municipality-level maps require external geojson data.
 """
 
+import httpx
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+import pandas as pd
 import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
 
+# get_connection() is expected to return a process-wide DuckDB connection
+# (cached with st.cache_resource); every query helper below calls it per cache miss.
 from data.queries import (
     get_connection,
     get_regions,
@@ -34,7 +40,7 @@ Passe o mouse sobre cada area para ver detalhes.
 # Sidebar filters
 st.sidebar.header("Filtros")
 year_options = list(range(2023, 2012, -1))
-selected_year = st.sidebar.selectbox("Ano", year_options, index=0)
+selected_year = st.sidebar.selectbox("Ano", year_options, index=0, key="map_year")
 
 metric_options = {
     "dependency_ratio": "Dependencia Fiscal (%)",
@@ -44,12 +50,24 @@ metric_options = {
     "transferencias_per_capita": "Transferencias per Capita (R$)",
     "despesa_total_per_capita": "Despesa per Capita (R$)",
 }
+# Color scale and ranking direction per metric (higher is better unless ascending)
+METRIC_CFG = {
+    "dependency_ratio": {"cmap": "RdYlGn_r", "ascending": True},
+    "efficiency_index": {"cmap": "RdYlGn", "ascending": False},
+    "own_revenue_ratio": {"cmap": "RdYlGn", "ascending": False},
+    "revenue_effort_index": {"cmap": "RdYlGn", "ascending": False},
+    "transferencias_per_capita": {"cmap": "RdYlGn_r", "ascending": False},
+    "despesa_total_per_capita": {"cmap": "RdYlGn_r", "ascending": False},
+}
+
 selected_metric = st.sidebar.selectbox(
     "Metrica",
     list(metric_options.keys()),
     format_func=lambda x: metric_options[x],
-    index=0
+    index=0,
+    key="map_metric",
 )
+metric_cfg = METRIC_CFG[selected_metric]
 
 # Brazilian states mapping for Plotly (ISO codes)
 BR_STATES = {
@@ -61,6 +79,11 @@ BR_STATES = {
     'SE': 'BR-SE', 'TO': 'BR-TO'
 }
 
+BR_STATES_GEOJSON_URL = (
+    "https://raw.githubusercontent.com/codeforamerica/click_that_hood/"
+    "master/public/data/brazil-states.geojson"
+)
+
 # Region colors
 REGION_COLORS = {
     "Norte": "#27ae60",
@@ -71,103 +94,304 @@ REGION_COLORS = {
 }
 
 
-@st.cache_data(ttl=3600)
-def get_state_metrics(year: int) -> pl.DataFrame:
-    """Get aggregated metrics by state."""
+# Coordinate precision kept in the GeoJSON (~100 m, plenty for a state map)
+GEOJSON_DECIMALS = 3
+
+
+def _round_coords(coords: list, ndigits: int) -> list:
+    """Round a (nested) GeoJSON coordinate array."""
+    if coords and isinstance(coords[0], (int, float)):
+        return [round(c, ndigits) for c in coords]
+    return [_round_coords(c, ndigits) for c in coords]
+
+
+@st.cache_resource
+def load_br_geojson() -> dict:
+    """Fetch the Brazil states GeoJSON once per process, trimmed for embedding.
+
+    The dict is embedded in every choropleth sent to the browser, so only the
+    ``sigla`` property used as featureidkey is kept and coordinates are
+    rounded to GEOJSON_DECIMALS. Download errors are raised rather than
+    cached, so a failed fetch is retried on the next rerun.
+    """
+    response = httpx.get(BR_STATES_GEOJSON_URL, timeout=10, follow_redirects=True)
+    response.raise_for_status()
+    geojson = response.json()
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"sigla": feature["properties"]["sigla"]},
+                "geometry": {
+                    "type": feature["geometry"]["type"],
+                    "coordinates": _round_coords(
+                        feature["geometry"]["coordinates"], GEOJSON_DECIMALS
+                    ),
+                },
+            }
+            for feature in geojson["features"]
+        ],
+    }
+
+
+def br_geojson() -> dict | str:
+    """States GeoJSON for px.choropleth, or its URL if the download failed."""
+    try:
+        return load_br_geojson()
+    except (httpx.HTTPError, ValueError, KeyError):
+        # Let the browser fetch the full file instead
+        return BR_STATES_GEOJSON_URL
+
+
+@st.cache_resource
+def _uf_options() -> tuple[str, ...]:
+    """State filter options, queried once per process."""
+    return ("All", *get_states())
+
+
+@st.cache_resource(ttl=3600)
+def get_state_and_region_metrics(year: int) -> tuple[pa.Table, pa.Table]:
+    """Get aggregated metrics by state and by region in a single scan."""
     conn = get_connection()
 
+    # Each mart is aggregated on its own so a duplicated (id_municipio, ano) row
+    # in the efficiency mart cannot inflate num_municipios or the fiscal averages.
     query = f"""
+    WITH dep AS (
+        SELECT
+            sigla_uf,
+            regiao,
+            GROUPING(sigla_uf) as is_region_only,
+            COUNT(*) as num_municipios,
+            AVG(dependency_ratio) as dependency_ratio,
+            AVG(own_revenue_ratio) as own_revenue_ratio,
+            AVG(revenue_effort_index) as revenue_effort_index,
+            AVG(transferencias_per_capita) as transferencias_per_capita,
+            SUM(populacao) as populacao_total
+        FROM {MARTS_SCHEMA}.mart_dependencia_fiscal
+        WHERE ano = ?
+        GROUP BY GROUPING SETS ((sigla_uf, regiao), (regiao))
+    ),
+    ef AS (
+        SELECT
+            sigla_uf,
+            regiao,
+            GROUPING(sigla_uf) as is_region_only,
+            AVG(efficiency_index) as efficiency_index,
+            AVG(despesa_total_per_capita) as despesa_total_per_capita,
+            AVG(social_outcome_score) as social_outcome_score
+        FROM {MARTS_SCHEMA}.mart_eficiencia_municipal
+        WHERE ano = ?
+        GROUP BY GROUPING SETS ((sigla_uf, regiao), (regiao))
+    )
     SELECT
-        d.sigla_uf,
-        d.regiao,
-        COUNT(*) as num_municipios,
-        AVG(d.dependency_ratio) as dependency_ratio,
-        AVG(d.own_revenue_ratio) as own_revenue_ratio,
-        AVG(d.revenue_effort_index) as revenue_effort_index,
-        AVG(d.transferencias_per_capita) as transferencias_per_capita,
-        AVG(e.efficiency_index) as efficiency_index,
-        AVG(e.despesa_total_per_capita) as despesa_total_per_capita,
-        AVG(e.social_outcome_score) as social_outcome_score,
-        SUM(d.populacao) as populacao_total
-    FROM {MARTS_SCHEMA}.mart_dependencia_fiscal d
-    LEFT JOIN {MARTS_SCHEMA}.mart_eficiencia_municipal e
-        ON d.id_municipio = e.id_municipio AND d.ano = e.ano
-    WHERE d.ano = {year}
-    GROUP BY d.sigla_uf, d.regiao
-    ORDER BY d.sigla_uf
+        dep.sigla_uf,
+        dep.regiao,
+        dep.is_region_only,
+        dep.num_municipios,
+        dep.dependency_ratio,
+        dep.own_revenue_ratio,
+        dep.revenue_effort_index,
+        dep.transferencias_per_capita,
+        ef.efficiency_index,
+        ef.despesa_total_per_capita,
+        ef.social_outcome_score,
+        dep.populacao_total
+    FROM dep
+    LEFT JOIN ef
+        ON dep.sigla_uf IS NOT DISTINCT FROM ef.sigla_uf
+        AND dep.regiao = ef.regiao
+        AND dep.is_region_only = ef.is_region_only
+    ORDER BY dep.sigla_uf, dep.regiao
     """
 
     try:
-        return conn.execute(query).pl()
+        tbl = conn.execute(query, [year, year]).arrow()
     except Exception:
-        return pl.DataFrame()
+        return pa.table({}), pa.table({})
 
+    states = tbl.filter(pc.field("is_region_only") == 0)
+    regions = tbl.filter(pc.field("is_region_only") == 1)
+    return (
+        states.drop_columns(["is_region_only"]),
+        regions.drop_columns(["is_region_only", "sigla_uf"]),
+    )
 
-@st.cache_data(ttl=3600)
-def get_region_metrics(year: int) -> pl.DataFrame:
+
+def get_state_metrics(year: int) -> pa.Table:
+    """Get aggregated metrics by state."""
+    return get_state_and_region_metrics(year)[0]
+
+
+def get_region_metrics(year: int) -> pa.Table:
     """Get aggregated metrics by region."""
+    return get_state_and_region_metrics(year)[1]
+
+
+# Numeric columns of the base CTE that may be interpolated into SQL as the metric
+SQL_METRIC_COLUMNS = frozenset({
+    "dependency_ratio",
+    "efficiency_index",
+    "own_revenue_ratio",
+    "revenue_effort_index",
+    "transferencias_per_capita",
+    "despesa_total_per_capita",
+})
+
+
+def _check_metric(metric: str) -> str:
+    """Return metric if it is a whitelisted base column, else raise ValueError."""
+    if metric not in SQL_METRIC_COLUMNS:
+        raise ValueError(f"Unknown metric: {metric}")
+    return metric
+
+
+def _municipality_base(year: int, uf: str) -> tuple[str, list[object]]:
+    """Build the filtered municipality CTE shared by the map and aggregate queries."""
+    params: list[object] = [year]
+    uf_filter = ""
+    if uf != "All":
+        uf_filter = "AND d.sigla_uf = ?"
+        params.append(uf)
+
+    cte = f"""
+    WITH base AS (
+        SELECT
+            d.id_municipio,
+            d.nome_municipio,
+            d.sigla_uf,
+            d.regiao,
+            d.populacao,
+            d.dependency_ratio,
+            d.own_revenue_ratio,
+            d.revenue_effort_index,
+            d.transferencias_per_capita,
+            d.categoria_dependencia,
+            e.efficiency_index,
+            e.despesa_total_per_capita,
+            e.social_outcome_score,
+            e.categoria_eficiencia
+        FROM {MARTS_SCHEMA}.mart_dependencia_fiscal d
+        LEFT JOIN {MARTS_SCHEMA}.mart_eficiencia_municipal e
+            ON d.id_municipio = e.id_municipio AND d.ano = e.ano
+        WHERE d.ano = ?
+          {uf_filter}
+    )
+    """
+    return cte, params
+
+
+@st.cache_resource(ttl=3600)
+def get_municipality_map_data(year: int, uf: str = "All") -> pa.Table:
+    """Get municipality-level data for mapping."""
     conn = get_connection()
+    base, params = _municipality_base(year, uf)
 
-    query = f"""
+    try:
+        return conn.execute(base + "SELECT * FROM base", params).arrow()
+    except Exception:
+        return pa.table({})
+
+
+@st.cache_resource(ttl=3600)
+def get_municipality_extremes(
+    year: int,
+    uf: str,
+    metric: str,
+) -> tuple[dict[str, float | int | None], pa.Table]:
+    """Get summary statistics and the 10 highest/lowest municipalities for a metric."""
+    metric = _check_metric(metric)
+
+    conn = get_connection()
+    base, params = _municipality_base(year, uf)
+
+    stats_query = base + f"""
+    SELECT
+        COUNT(*) as n,
+        AVG({metric}) as mean,
+        MIN({metric}) as min,
+        MAX({metric}) as max
+    FROM base
+    """
+
+    extremes_query = base + f"""
     SELECT
-        d.regiao,
-        COUNT(*) as num_municipios,
-        AVG(d.dependency_ratio) as dependency_ratio,
-        AVG(d.own_revenue_ratio) as own_revenue_ratio,
-        AVG(d.revenue_effort_index) as revenue_effort_index,
-        AVG(d.transferencias_per_capita) as transferencias_per_capita,
-        AVG(e.efficiency_index) as efficiency_index,
-        AVG(e.despesa_total_per_capita) as despesa_total_per_capita,
-        AVG(e.social_outcome_score) as social_outcome_score,
-        SUM(d.populacao) as populacao_total
-    FROM {MARTS_SCHEMA}.mart_dependencia_fiscal d
-    LEFT JOIN {MARTS_SCHEMA}.mart_eficiencia_municipal e
-        ON d.id_municipio = e.id_municipio AND d.ano = e.ano
-    WHERE d.ano = {year}
-    GROUP BY d.regiao
-    ORDER BY d.regiao
+        id_municipio,
+        nome_municipio,
+        sigla_uf,
+        populacao,
+        {metric},
+        ROW_NUMBER() OVER (ORDER BY {metric} DESC) as pos_top,
+        ROW_NUMBER() OVER (ORDER BY {metric} ASC) as pos_bottom
+    FROM base
+    WHERE {metric} IS NOT NULL
+    QUALIFY pos_top <= 10 OR pos_bottom <= 10
     """
 
     try:
-        return conn.execute(query).pl()
+        n, mean, vmin, vmax = conn.execute(stats_query, params).fetchone()
+        extremes = conn.execute(extremes_query, params).arrow()
     except Exception:
-        return pl.DataFrame()
+        return {}, pa.table({})
 
+    return {"n": n, "mean": mean, "min": vmin, "max": vmax}, extremes
 
-@st.cache_data(ttl=3600)
-def get_municipality_map_data(year: int, uf: str = "All") -> pl.DataFrame:
-    """Get municipality-level data for mapping."""
-    conn = get_connection()
 
-    uf_filter = f"AND d.sigla_uf = '{uf}'" if uf != "All" else ""
+@st.cache_resource(ttl=3600)
+def get_metric_histogram(
+    year: int,
+    uf: str,
+    metric: str,
+    vmin: float,
+    vmax: float,
+    nbins: int = 50,
+) -> pa.Table:
+    """Get municipality counts per (region, bin) for a metric, binned in DuckDB."""
+    metric = _check_metric(metric)
 
-    query = f"""
+    conn = get_connection()
+    base, params = _municipality_base(year, uf)
+    width = (vmax - vmin) / nbins or 1.0
+
+    query = base + f"""
     SELECT
-        d.id_municipio,
-        d.nome_municipio,
-        d.sigla_uf,
-        d.regiao,
-        d.populacao,
-        d.dependency_ratio,
-        d.own_revenue_ratio,
-        d.revenue_effort_index,
-        d.transferencias_per_capita,
-        d.categoria_dependencia,
-        e.efficiency_index,
-        e.despesa_total_per_capita,
-        e.social_outcome_score,
-        e.categoria_eficiencia
-    FROM {MARTS_SCHEMA}.mart_dependencia_fiscal d
-    LEFT JOIN {MARTS_SCHEMA}.mart_eficiencia_municipal e
-        ON d.id_municipio = e.id_municipio AND d.ano = e.ano
-    WHERE d.ano = {year}
-      {uf_filter}
+        regiao,
+        LEAST(FLOOR(({metric} - ?) / ?), ?)::INTEGER as bin,
+        COUNT(*) as n
+    FROM base
+    WHERE {metric} IS NOT NULL
+    GROUP BY 1, 2
+    ORDER BY 1, 2
     """
 
     try:
-        return conn.execute(query).pl()
+        return conn.execute(query, params + [vmin, width, nbins - 1]).arrow()
     except Exception:
-        return pl.DataFrame()
+        return pa.table({})
+
+
+@st.cache_data(ttl=3600)
+def get_state_ranking(year: int, metric: str) -> pl.DataFrame:
+    """Rank states by a metric for the ranking table."""
+    state_ranking = (
+        pl.from_arrow(get_state_metrics(year))
+        .with_columns(
+            pl.col(metric)
+            .rank(method="ordinal", descending=not METRIC_CFG[metric]["ascending"])
+            .cast(pl.Int32)
+            .alias("ranking")
+        )
+        .sort("ranking", nulls_last=True)
+    )
+    return state_ranking.select('ranking', 'sigla_uf', 'regiao', 'num_municipios', metric)
+
+
+def to_plot_frame(data: pa.Table | pl.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Project query results to the columns a chart uses, as pandas."""
+    frame = pl.from_arrow(data) if isinstance(data, pa.Table) else data
+    columns = list(dict.fromkeys(columns))
+    return frame.lazy().select(columns).collect().to_pandas()
 
 
 # =============================================================================
@@ -178,18 +402,23 @@ st.header("📍 Mapa por Estado")
 try:
     state_data = get_state_metrics(selected_year)
 
-    if not state_data.is_empty():
-        df = state_data.to_pandas()
-        df['iso_code'] = df['sigla_uf'].map(BR_STATES)
+    if state_data.num_rows:
+        state_frame = pl.from_arrow(state_data).with_columns(
+            pl.col('sigla_uf').replace(BR_STATES).alias('iso_code')
+        )
+        df = to_plot_frame(state_frame, [
+            'sigla_uf', 'iso_code', 'regiao', 'num_municipios', 'dependency_ratio',
+            'efficiency_index', 'populacao_total', selected_metric,
+        ])
 
         # Create choropleth map
         fig = px.choropleth(
             df,
-            geojson="https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson",
+            geojson=br_geojson(),
             locations='sigla_uf',
             featureidkey="properties.sigla",
             color=selected_metric,
-            color_continuous_scale="RdYlGn" if selected_metric in ['efficiency_index', 'own_revenue_ratio', 'revenue_effort_index'] else "RdYlGn_r",
+            color_continuous_scale=metric_cfg["cmap"],
             hover_name='sigla_uf',
             hover_data={
                 'regiao': True,
@@ -223,11 +452,8 @@ try:
 
         # State ranking table
         st.subheader("📊 Ranking por Estado")
-        df_display = df.sort_values(selected_metric, ascending=(selected_metric == 'dependency_ratio'))
-        df_display['ranking'] = range(1, len(df_display) + 1)
-
         st.dataframe(
-            df_display[['ranking', 'sigla_uf', 'regiao', 'num_municipios', selected_metric]],
+            get_state_ranking(selected_year, selected_metric),
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -254,8 +480,11 @@ st.header("🌎 Comparação Regional")
 try:
     region_data = get_region_metrics(selected_year)
 
-    if not region_data.is_empty():
-        df_region = region_data.to_pandas()
+    if region_data.num_rows:
+        df_region = to_plot_frame(region_data, [
+            'regiao', 'num_municipios', 'dependency_ratio', 'efficiency_index',
+            'own_revenue_ratio', 'populacao_total', selected_metric,
+        ])
 
         col1, col2 = st.columns(2)
 
@@ -278,11 +507,12 @@ try:
 
         with col2:
             # Radar chart for all metrics
-            metrics_for_radar = ['dependency_ratio', 'efficiency_index', 'own_revenue_ratio']
-
             fig_radar = go.Figure()
 
-            for _, row in df_region.iterrows():
+            radar_rows = pl.from_arrow(region_data).select(
+                'regiao', 'dependency_ratio', 'efficiency_index', 'own_revenue_ratio'
+            )
+            for row in radar_rows.iter_rows(named=True):
                 fig_radar.add_trace(go.Scatterpolar(
                     r=[row['dependency_ratio'], row['efficiency_index'], row['own_revenue_ratio']],
                     theta=['Dependência (%)', 'Eficiência', 'Receita Própria (%)'],
@@ -304,7 +534,10 @@ try:
         # Region summary table
         st.subheader("📋 Resumo por Região")
         st.dataframe(
-            df_region[['regiao', 'num_municipios', 'dependency_ratio', 'efficiency_index', 'own_revenue_ratio', 'populacao_total']],
+            pl.from_arrow(region_data).select(
+                'regiao', 'num_municipios', 'dependency_ratio', 'efficiency_index',
+                'own_revenue_ratio', 'populacao_total',
+            ),
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -331,50 +564,80 @@ O tamanho da bolha representa a população e a cor representa a métrica seleci
 
 selected_uf_map = st.selectbox(
     "Estado para visualização detalhada",
-    ["All"] + get_states(),
+    _uf_options(),
     index=0,
     key="uf_bubble_map"
 )
 
+detail_level = st.radio(
+    "Nível de detalhe do box plot",
+    ["Box plot resumido (top 500)", "Box plot detalhado (todos)"],
+    index=0,
+    horizontal=True,
+    key="muni_detail_level",
+    help=(
+        "Limita apenas o box plot, e só quando todos os estados estão selecionados. "
+        "Estatísticas, histograma e Top/Bottom 10 sempre usam todos os municípios."
+    ),
+)
+
 try:
     muni_data = get_municipality_map_data(selected_year, selected_uf_map)
 
-    if not muni_data.is_empty():
-        df_muni = muni_data.to_pandas()
+    if muni_data.num_rows:
+        muni = pl.from_arrow(muni_data)
+
+        # Limit the box plot to the top 500 municipalities by population; the
+        # stats, histogram and Top/Bottom 10 below are aggregated in DuckDB
+        if (
+            muni.height > 500
+            and selected_uf_map == "All"
+            and detail_level == "Box plot resumido (top 500)"
+        ):
+            muni = muni.top_k(500, by="populacao")
+            st.info(
+                "Box plot limitado aos 500 municípios mais populosos. "
+                "Estatísticas, histograma e Top/Bottom 10 usam todos os municípios."
+            )
 
-        # Limit to top 500 municipalities by population for performance
-        if len(df_muni) > 500 and selected_uf_map == "All":
-            df_muni = df_muni.nlargest(500, 'populacao')
-            st.info("Mostrando os 500 municípios mais populosos para melhor performance.")
+        cat_col = 'categoria_dependencia' if selected_metric == 'dependency_ratio' else 'categoria_eficiencia'
+        df_muni = to_plot_frame(muni, [
+            'id_municipio', 'nome_municipio', 'sigla_uf', 'regiao', 'populacao',
+            selected_metric, cat_col,
+        ])
 
-        # Summary stats
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Municípios", f"{len(df_muni):,}")
-        with col2:
-            st.metric(
-                "Média " + metric_options[selected_metric][:15],
-                f"{df_muni[selected_metric].mean():.1f}"
-            )
-        with col3:
-            st.metric(
-                "Min",
-                f"{df_muni[selected_metric].min():.1f}"
-            )
-        with col4:
-            st.metric(
-                "Max",
-                f"{df_muni[selected_metric].max():.1f}"
-            )
+        stats, extremes = get_municipality_extremes(
+            selected_year, selected_uf_map, selected_metric
+        )
+        extremes = pl.from_arrow(extremes)
+
+        # Summary stats (computed in DuckDB over every municipality in the filter)
+        if stats.get("mean") is not None:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Municípios", f"{stats['n']:,}")
+            with col2:
+                st.metric(
+                    "Média " + metric_options[selected_metric][:15],
+                    f"{stats['mean']:.1f}"
+                )
+            with col3:
+                st.metric(
+                    "Min",
+                    f"{stats['min']:.1f}"
+                )
+            with col4:
+                st.metric(
+                    "Max",
+                    f"{stats['max']:.1f}"
+                )
 
         # Box plot by category
-        cat_col = 'categoria_dependencia' if selected_metric == 'dependency_ratio' else 'categoria_eficiencia'
         if cat_col in df_muni.columns:
             fig_box = px.box(
                 df_muni,
                 x=cat_col,
                 y=selected_metric,
-                color=cat_col,
                 title=f"Distribuição de {metric_options[selected_metric]} por Categoria",
                 labels={
                     cat_col: 'Categoria',
@@ -384,20 +647,36 @@ try:
             fig_box.update_layout(showlegend=False)
             st.plotly_chart(fig_box, use_container_width=True)
 
-        # Histogram
-        fig_hist = px.histogram(
-            df_muni,
-            x=selected_metric,
-            nbins=50,
-            color='regiao',
-            color_discrete_map=REGION_COLORS,
-            title=f"Distribuição de {metric_options[selected_metric]}",
-            labels={
-                selected_metric: metric_options[selected_metric],
-                'count': 'Municípios'
-            }
-        )
-        st.plotly_chart(fig_hist, use_container_width=True)
+        # Histogram (pre-binned server-side; only ~250 bars reach Plotly)
+        if stats.get("mean") is not None:
+            nbins = 50
+            hist = pl.from_arrow(get_metric_histogram(
+                selected_year, selected_uf_map, selected_metric,
+                stats["min"], stats["max"], nbins,
+            ))
+            bin_width = (stats["max"] - stats["min"]) / nbins or 1.0
+
+            fig_hist = go.Figure()
+            for regiao, color in REGION_COLORS.items():
+                region_bins = hist.filter(pl.col("regiao") == regiao)
+                if region_bins.is_empty():
+                    continue
+                fig_hist.add_trace(go.Bar(
+                    x=(stats["min"] + (region_bins["bin"].to_numpy() + 0.5) * bin_width),
+                    y=region_bins["n"].to_numpy(),
+                    width=bin_width,
+                    name=regiao,
+                    marker_color=color,
+                ))
+            fig_hist.update_layout(
+                barmode="stack",
+                bargap=0,
+                title=f"Distribuição de {metric_options[selected_metric]}",
+                xaxis_title=metric_options[selected_metric],
+                yaxis_title="Municípios",
+                legend_title="Região",
+            )
+            st.plotly_chart(fig_hist, use_container_width=True)
 
         # Top/Bottom municipalities
         col1, col2 = st.columns(2)
@@ -405,8 +684,11 @@ try:
         with col1:
             st.subheader("🏆 Top 10")
             st.caption("Clique em uma linha para ver o perfil do município")
-            top_10 = df_muni.nlargest(10, selected_metric).copy()
-            top_10['ranking'] = range(1, len(top_10) + 1)
+            top_10 = (
+                extremes.filter(pl.col("pos_top") <= 10)
+                .sort("pos_top")
+                .rename({"pos_top": "ranking"})
+            )
             render_clickable_ranking_table(
                 df=top_10,
                 display_columns=['ranking', 'nome_municipio', 'sigla_uf', selected_metric, 'populacao'],
@@ -427,8 +709,11 @@ try:
         with col2:
             st.subheader("📉 Bottom 10")
             st.caption("Clique em uma linha para ver o perfil do município")
-            bottom_10 = df_muni.nsmallest(10, selected_metric).copy()
-            bottom_10['ranking'] = range(1, len(bottom_10) + 1)
+            bottom_10 = (
+                extremes.filter(pl.col("pos_bottom") <= 10)
+                .sort("pos_bottom")
+                .rename({"pos_bottom": "ranking"})
+            )
             render_clickable_ranking_table(
                 df=bottom_10,
                 display_columns=['ranking', 'nome_municipio', 'sigla_uf', selected_metric, 'populacao'],
@@ -7,19 +7,24 @@ based on IDHM, IVS, Gini, and income indicators.
 
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 import polars as pl
+import pyarrow as pa
 
 from data.queries import (
     get_cluster_summary,
     get_cluster_municipalities,
     get_cluster_distribution_by_region,
     get_cluster_distribution_by_state,
-    get_cluster_transitions_potential,
     get_cluster_scatter_data,
+    get_connection,
     get_regions,
     get_states,
+    MARTS_SCHEMA,
 )
 from components.navigation import render_clickable_ranking_table
+from components.sampling import stratified_sample
 
 # Page config
 st.set_page_config(
@@ -42,6 +47,8 @@ CLUSTER_COLORS = {
     3: "#e67e22",  # Orange - Vulnerable
     4: "#e74c3c",  # Red - Critical
 }
+CLUSTER_COLOR_SEQ = [CLUSTER_COLORS[i] for i in range(5)]
+CLUSTER_COLOR_MAP = {i: CLUSTER_COLORS[i] for i in range(5)}
 
 CLUSTER_LABELS = {
     0: "Polos de Desenvolvimento",
@@ -59,6 +66,154 @@ REGION_COLORS = {
     "Centro-Oeste": "#f39c12",
 }
 
+# Shared horizontal legend layouts; the state chart's rotated ticks need more room
+LEGEND_H_BOTTOM = {"legend": {"orientation": "h", "y": -0.15}}
+LEGEND_H_BELOW_TICKS = {"legend": {"orientation": "h", "y": -0.25}}
+
+# Scatter points sent to the browser; larger selections are sampled per cluster
+MAX_SCATTER_POINTS = 2000
+
+
+@st.cache_data(ttl=3600)
+def build_region_stack_json() -> str | None:
+    """Build the cluster-by-region stacked bar and cache it as Plotly JSON."""
+    region_dist = get_cluster_distribution_by_region()
+    if region_dist.is_empty():
+        return None
+
+    fig = px.bar(
+        region_dist.to_pandas(),
+        x="regiao",
+        y="count",
+        color="cluster_label",
+        color_discrete_sequence=CLUSTER_COLOR_SEQ,
+        title="Distribuicao de Clusters por Regiao",
+        labels={
+            "regiao": "Regiao",
+            "count": "Numero de Municipios",
+            "cluster_label": "Nivel"
+        },
+        barmode="stack"
+    )
+    fig.update_layout(**LEGEND_H_BOTTOM)
+    return pio.to_json(fig)
+
+
+@st.cache_data(ttl=3600)
+def build_scatter_json(region: str, uf: str) -> tuple[str, int, int] | None:
+    """Build the IDHM vs IVS scatter for a filter combo and cache it as Plotly JSON.
+
+    Expires with the other cluster charts so a re-clustering shows up within
+    the hour; clear it sooner with the sidebar button shown under ``?debug``.
+    Returns the figure JSON with the number of points plotted and available.
+    """
+    scatter_data = get_cluster_scatter_data(region=region, uf=uf)
+    if scatter_data.is_empty():
+        return None
+
+    total = scatter_data.height
+    scatter_data = stratified_sample(scatter_data, "cluster_label", MAX_SCATTER_POINTS)
+
+    fig = px.scatter(
+        scatter_data.to_pandas(),
+        x="idhm_2010",
+        y="ivs_2010",
+        color="cluster_label",
+        color_discrete_sequence=CLUSTER_COLOR_SEQ,
+        size="populacao",
+        size_max=40,
+        render_mode="webgl",
+        hover_name="nome_municipio",
+        hover_data={
+            "sigla_uf": True,
+            "idhm_2010": ":.3f",
+            "ivs_2010": ":.3f",
+            "gini_2010": ":.3f",
+            "populacao": ":,.0f",
+            "cluster_label": False
+        },
+        title="Municipios: IDHM vs IVS (coloridos por cluster)",
+        labels={
+            "idhm_2010": "IDHM (2010)",
+            "ivs_2010": "IVS (2010) - Vulnerabilidade",
+            "cluster_label": "Nivel"
+        }
+    )
+    # Invert Y axis so lower vulnerability is at top
+    fig.update_yaxes(autorange="reversed")
+    fig.update_layout(
+        **LEGEND_H_BOTTOM,
+        height=600
+    )
+    return pio.to_json(fig), scatter_data.height, total
+
+
+@st.cache_data(ttl=3600)
+def build_state_stack_json(region: str) -> str | None:
+    """Build the cluster-by-state stacked bar and cache it as Plotly JSON."""
+    state_dist = get_cluster_distribution_by_state()
+
+    # Filter by selected region if applicable
+    if region != "All":
+        state_dist = state_dist.filter(pl.col("regiao") == region)
+
+    if state_dist.is_empty():
+        return None
+
+    fig = px.bar(
+        state_dist.to_pandas(),
+        x="sigla_uf",
+        y="count",
+        color="cluster_label",
+        color_discrete_sequence=CLUSTER_COLOR_SEQ,
+        title="Distribuicao de Clusters por Estado",
+        labels={
+            "sigla_uf": "Estado",
+            "count": "Municipios",
+            "cluster_label": "Nivel"
+        },
+        barmode="stack"
+    )
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        **LEGEND_H_BELOW_TICKS,
+        height=500
+    )
+    return pio.to_json(fig)
+
+
+def _get_transition_candidates(mart: str) -> pa.Table:
+    """Read one of the precomputed top-20 transition marts."""
+    conn = get_connection()
+
+    query = f"""
+    SELECT
+        nome_municipio,
+        sigla_uf,
+        cluster_label,
+        idhm_2010,
+        idhm_vs_cluster
+    FROM {MARTS_SCHEMA}.{mart}
+    """
+
+    try:
+        return conn.execute(query).arrow()
+    except Exception:
+        return pa.table({})
+
+
+@st.cache_resource(ttl=3600)
+def get_promo_candidates() -> pa.Table:
+    """Municipalities most likely to move up a cluster (max 20)."""
+    return _get_transition_candidates("mart_cluster_promo_candidates")
+
+
+@st.cache_resource(ttl=3600)
+def get_risk_candidates() -> pa.Table:
+    """Municipalities most at risk of moving down a cluster (max 20)."""
+    return _get_transition_candidates("mart_cluster_risk_candidates")
+
+
 # Sidebar filters
 st.sidebar.header("Filtros")
 regions = ["All"] + get_regions()
@@ -67,45 +222,54 @@ selected_region = st.sidebar.selectbox("Regiao", regions, index=0)
 states = ["All"] + get_states()
 selected_uf = st.sidebar.selectbox("Estado (UF)", states, index=0)
 
+if "debug" in st.query_params and st.sidebar.button("Limpar cache do scatter"):
+    build_scatter_json.clear()
+
 # =============================================================================
 # CLUSTER OVERVIEW
 # =============================================================================
 st.header("📊 Visao Geral dos Clusters")
 
+cluster_summary_ok = False
 try:
     cluster_summary = get_cluster_summary()
+    # Converted once and reused by the overview charts
+    summary_df = cluster_summary.to_pandas()
 
     if not cluster_summary.is_empty():
-        # KPI Cards - one per cluster
-        cols = st.columns(5)
-
-        for i, col in enumerate(cols):
-            row = cluster_summary.filter(pl.col("cluster_id") == i)
-            if not row.is_empty():
-                with col:
-                    count = int(row["num_municipios"][0])
-                    label = CLUSTER_LABELS.get(i, f"Cluster {i}")
-                    color = CLUSTER_COLORS.get(i, "#666")
-                    avg_idhm = float(row["avg_idhm"][0])
-
-                    st.markdown(
-                        f"""<div style='text-align:center; padding:12px;
-                        background-color:{color}20; border-radius:8px;
-                        border-left: 4px solid {color};'>
-                        <h3 style='margin:0; color:{color};'>{count:,}</h3>
-                        <small style='font-size:11px;'>{label}</small><br>
-                        <small style='color:#666;'>IDHM: {avg_idhm:.3f}</small>
-                        </div>""",
-                        unsafe_allow_html=True
-                    )
+        cluster_summary_ok = True
+        # KPI Cards - one per cluster, rendered as a single flex row
+        by_id = {row["cluster_id"]: row for row in cluster_summary.iter_rows(named=True)}
+        cards = []
+        for i in range(5):
+            row = by_id.get(i)
+            if row is not None:
+                count = int(row["num_municipios"])
+                label = CLUSTER_LABELS.get(i, f"Cluster {i}")
+                color = CLUSTER_COLORS.get(i, "#666")
+                avg_idhm = float(row["avg_idhm"])
+
+                cards.append(
+                    f"""<div style='flex:1; text-align:center; padding:12px;
+                    background-color:{color}20; border-radius:8px;
+                    border-left: 4px solid {color};'>
+                    <h3 style='margin:0; color:{color};'>{count:,}</h3>
+                    <small style='font-size:11px;'>{label}</small><br>
+                    <small style='color:#666;'>IDHM: {avg_idhm:.3f}</small>
+                    </div>"""
+                )
+
+        st.markdown(
+            f"<div style='display:flex; gap:16px;'>{''.join(cards)}</div>",
+            unsafe_allow_html=True
+        )
 
         st.markdown("---")
 
         # Summary table
         st.subheader("Perfil dos Clusters")
-        display_df = cluster_summary.to_pandas()
         st.dataframe(
-            display_df,
+            cluster_summary.to_arrow(),
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -127,7 +291,7 @@ try:
         st.warning(
             "Dados de clusters nao disponiveis. Execute o pipeline de clustering:\n\n"
             "1. `python -m src.analysis.clustering`\n"
-            "2. `cd dbt_project && dbt seed && dbt run --select mart_cluster_analysis`"
+            "2. `cd dbt_project && dbt seed && dbt run --select mart_cluster_analysis+`"
         )
 except Exception as e:
     st.error(f"Erro ao carregar dados de clusters: {e}")
@@ -135,7 +299,7 @@ except Exception as e:
         "Execute o pipeline de clustering primeiro:\n\n"
         "```bash\n"
         "python -m src.analysis.clustering\n"
-        "cd dbt_project && dbt seed && dbt run --select mart_cluster_analysis\n"
+        "cd dbt_project && dbt seed && dbt run --select mart_cluster_analysis+\n"
         "```"
     )
 
@@ -152,51 +316,50 @@ tab_pie, tab_bar, tab_scatter = st.tabs([
 
 with tab_pie:
     try:
-        if 'cluster_summary' in dir() and not cluster_summary.is_empty():
-            df = cluster_summary.to_pandas()
-
-            # Map cluster_id to color
-            df["color"] = df["cluster_id"].map(CLUSTER_COLORS)
-
-            fig = px.pie(
-                df,
-                values="num_municipios",
-                names="cluster_label",
-                color="cluster_label",
-                color_discrete_sequence=[CLUSTER_COLORS[i] for i in range(5)],
-                title="Distribuicao de Municipios por Nivel de Desenvolvimento"
+        if cluster_summary_ok:
+            fig = go.Figure(go.Pie(
+                values=summary_df["num_municipios"].to_numpy(),
+                labels=summary_df["cluster_label"].to_numpy(),
+                marker_colors=CLUSTER_COLOR_SEQ,
+                textposition="inside",
+                textinfo="percent+label"
+            ))
+            fig.update_layout(
+                title="Distribuicao de Municipios por Nivel de Desenvolvimento",
+                showlegend=True,
+                **LEGEND_H_BOTTOM
             )
-            fig.update_traces(textposition="inside", textinfo="percent+label")
-            fig.update_layout(showlegend=True, legend=dict(orientation="h", y=-0.1))
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="pie_clusters_count")
 
             # Population distribution
             col1, col2 = st.columns(2)
             with col1:
-                fig2 = px.pie(
-                    df,
-                    values="total_populacao",
-                    names="cluster_label",
-                    color_discrete_sequence=[CLUSTER_COLORS[i] for i in range(5)],
-                    title="Distribuicao da Populacao por Cluster"
+                fig2 = go.Figure(go.Pie(
+                    values=summary_df["total_populacao"].to_numpy(),
+                    labels=summary_df["cluster_label"].to_numpy(),
+                    marker_colors=CLUSTER_COLOR_SEQ,
+                    textposition="inside",
+                    textinfo="percent+label"
+                ))
+                fig2.update_layout(
+                    title="Distribuicao da Populacao por Cluster",
+                    showlegend=False
                 )
-                fig2.update_traces(textposition="inside", textinfo="percent+label")
-                fig2.update_layout(showlegend=False)
-                st.plotly_chart(fig2, use_container_width=True)
+                st.plotly_chart(fig2, use_container_width=True, key="pie_clusters_pop")
 
             with col2:
                 # Average IDHM by cluster
                 fig3 = px.bar(
-                    df,
+                    summary_df,
                     x="cluster_label",
                     y="avg_idhm",
                     color="cluster_id",
-                    color_discrete_map={i: CLUSTER_COLORS[i] for i in range(5)},
+                    color_discrete_map=CLUSTER_COLOR_MAP,
                     title="IDHM Medio por Cluster",
                     labels={"cluster_label": "Cluster", "avg_idhm": "IDHM Medio"}
                 )
                 fig3.update_layout(showlegend=False, xaxis_tickangle=-45)
-                st.plotly_chart(fig3, use_container_width=True)
+                st.plotly_chart(fig3, use_container_width=True, key="bar_idhm_by_cluster")
     except Exception:
         st.info("Dados nao disponiveis para grafico de pizza.")
 
@@ -205,36 +368,36 @@ with tab_bar:
         region_dist = get_cluster_distribution_by_region()
 
         if not region_dist.is_empty():
-            df = region_dist.to_pandas()
-
-            fig = px.bar(
-                df,
-                x="regiao",
-                y="count",
-                color="cluster_label",
-                color_discrete_sequence=[CLUSTER_COLORS[i] for i in range(5)],
-                title="Distribuicao de Clusters por Regiao",
-                labels={
-                    "regiao": "Regiao",
-                    "count": "Numero de Municipios",
-                    "cluster_label": "Nivel"
-                },
-                barmode="stack"
-            )
-            fig.update_layout(legend=dict(orientation="h", y=-0.2))
-            st.plotly_chart(fig, use_container_width=True)
+            fig_json = build_region_stack_json()
+            if fig_json is not None:
+                st.plotly_chart(
+                    pio.from_json(fig_json), use_container_width=True, key="bar_region_stack"
+                )
 
             # Percentage breakdown table
             st.markdown("**Composicao Percentual por Regiao:**")
-            pivot_df = df.pivot_table(
-                index="regiao",
-                columns="cluster_label",
-                values="count",
-                fill_value=0
+            pivot_counts = (
+                region_dist.pivot(
+                    on="cluster_label",
+                    index="regiao",
+                    values="count",
+                    aggregate_function="sum"
+                )
+                .fill_null(0)
+                .sort("regiao")
+            )
+            cluster_cols = sorted(c for c in pivot_counts.columns if c != "regiao")
+            row_total = pl.sum_horizontal(cluster_cols)
+            pivot_pct = (
+                pivot_counts.select(
+                    "regiao",
+                    *[(pl.col(c) / row_total * 100).round(1) for c in cluster_cols]
+                )
+                .to_pandas()
+                .set_index("regiao")
             )
-            pivot_pct = pivot_df.div(pivot_df.sum(axis=1), axis=0) * 100
             st.dataframe(
-                pivot_pct.round(1).style.format("{:.1f}%"),
+                pivot_pct.style.format("{:.1f}%"),
                 use_container_width=True
             )
     except Exception:
@@ -242,47 +405,20 @@ with tab_bar:
 
 with tab_scatter:
     try:
-        scatter_data = get_cluster_scatter_data(
-            region=selected_region,
-            uf=selected_uf
-        )
+        scatter = build_scatter_json(selected_region, selected_uf)
 
-        if not scatter_data.is_empty():
-            df = scatter_data.to_pandas()
-
-            fig = px.scatter(
-                df,
-                x="idhm_2010",
-                y="ivs_2010",
-                color="cluster_label",
-                color_discrete_sequence=[CLUSTER_COLORS[i] for i in range(5)],
-                size="populacao",
-                size_max=40,
-                hover_name="nome_municipio",
-                hover_data={
-                    "sigla_uf": True,
-                    "idhm_2010": ":.3f",
-                    "ivs_2010": ":.3f",
-                    "gini_2010": ":.3f",
-                    "populacao": ":,.0f",
-                    "cluster_label": False
-                },
-                title="Municipios: IDHM vs IVS (coloridos por cluster)",
-                labels={
-                    "idhm_2010": "IDHM (2010)",
-                    "ivs_2010": "IVS (2010) - Vulnerabilidade",
-                    "cluster_label": "Nivel"
-                }
-            )
-            # Invert Y axis so lower vulnerability is at top
-            fig.update_yaxes(autorange="reversed")
-            fig.update_layout(
-                legend=dict(orientation="h", y=-0.15),
-                height=600
+        if scatter is not None:
+            fig_json, shown, total = scatter
+            st.plotly_chart(
+                pio.from_json(fig_json), use_container_width=True, key="scatter_idhm_ivs"
             )
-            st.plotly_chart(fig, use_container_width=True)
 
             st.caption("*Tamanho dos pontos proporcional a populacao. IVS invertido (menor = melhor).*")
+            if shown < total:
+                st.caption(
+                    f"Exibindo amostra de {shown:,} de {total:,} municipios "
+                    "(estratificada por cluster)."
+                )
         else:
             st.info("Nenhum dado encontrado para os filtros selecionados.")
     except Exception as e:
@@ -293,56 +429,63 @@ with tab_scatter:
 # =============================================================================
 st.header("🔍 Explorar Municipios por Cluster")
 
-selected_cluster = st.selectbox(
-    "Selecione um Nivel de Desenvolvimento",
-    options=list(CLUSTER_LABELS.keys()),
-    format_func=lambda x: f"{x} - {CLUSTER_LABELS[x]}"
-)
 
-try:
-    cluster_data = get_cluster_municipalities(
-        cluster_id=selected_cluster,
-        region=selected_region,
-        uf=selected_uf,
-        limit=200
+@st.fragment
+def cluster_explorer(selected_region: str, selected_uf: str) -> None:
+    """Cluster picker and municipality table; reruns on its own when the cluster changes."""
+    selected_cluster = st.selectbox(
+        "Selecione um Nivel de Desenvolvimento",
+        options=list(CLUSTER_LABELS.keys()),
+        format_func=lambda x: f"{x} - {CLUSTER_LABELS[x]}"
     )
 
-    if not cluster_data.is_empty():
-        count = len(cluster_data)
-        st.caption(
-            f"Mostrando **{count}** municipios do cluster: "
-            f"**{CLUSTER_LABELS[selected_cluster]}**"
+    try:
+        cluster_data = get_cluster_municipalities(
+            cluster_id=selected_cluster,
+            region=selected_region,
+            uf=selected_uf,
+            limit=200
         )
-        st.caption("*Clique em uma linha para ver o perfil do municipio*")
 
-        df = cluster_data.to_pandas()
+        if not cluster_data.is_empty():
+            count = len(cluster_data)
+            st.caption(
+                f"Mostrando **{count}** municipios do cluster: "
+                f"**{CLUSTER_LABELS[selected_cluster]}**"
+            )
+            st.caption("*Clique em uma linha para ver o perfil do municipio*")
+
+            render_clickable_ranking_table(
+                df=cluster_data,
+                display_columns=[
+                    "nome_municipio", "sigla_uf", "regiao", "populacao",
+                    "idhm_2010", "ivs_2010", "dependency_ratio", "efficiency_index",
+                    "status_transicao"
+                ],
+                column_config={
+                    "nome_municipio": "Municipio",
+                    "sigla_uf": "UF",
+                    "regiao": "Regiao",
+                    "populacao": st.column_config.NumberColumn("Populacao", format="%d"),
+                    "idhm_2010": st.column_config.NumberColumn("IDHM", format="%.3f"),
+                    "ivs_2010": st.column_config.NumberColumn("IVS", format="%.3f"),
+                    "dependency_ratio": st.column_config.NumberColumn(
+                        "Dependencia %", format="%.1f"
+                    ),
+                    "efficiency_index": st.column_config.NumberColumn("Eficiencia", format="%.1f"),
+                    "status_transicao": "Status Transicao",
+                },
+                id_column="id_municipio_ibge",
+                key=f"cluster_{selected_cluster}_table",
+                height=400
+            )
+        else:
+            st.info("Nenhum municipio encontrado para os filtros selecionados.")
+    except Exception as e:
+        st.warning(f"Erro ao carregar dados: {e}")
 
-        render_clickable_ranking_table(
-            df=df,
-            display_columns=[
-                "nome_municipio", "sigla_uf", "regiao", "populacao",
-                "idhm_2010", "ivs_2010", "dependency_ratio", "efficiency_index",
-                "status_transicao"
-            ],
-            column_config={
-                "nome_municipio": "Municipio",
-                "sigla_uf": "UF",
-                "regiao": "Regiao",
-                "populacao": st.column_config.NumberColumn("Populacao", format="%d"),
-                "idhm_2010": st.column_config.NumberColumn("IDHM", format="%.3f"),
-                "ivs_2010": st.column_config.NumberColumn("IVS", format="%.3f"),
-                "dependency_ratio": st.column_config.NumberColumn("Dependencia %", format="%.1f"),
-                "efficiency_index": st.column_config.NumberColumn("Eficiencia", format="%.1f"),
-                "status_transicao": "Status Transicao",
-            },
-            id_column="id_municipio_ibge",
-            key=f"cluster_{selected_cluster}_table",
-            height=400
-        )
-    else:
-        st.info("Nenhum municipio encontrado para os filtros selecionados.")
-except Exception as e:
-    st.warning(f"Erro ao carregar dados: {e}")
+
+cluster_explorer(selected_region, selected_uf)
 
 # =============================================================================
 # TRANSITION ANALYSIS
@@ -355,23 +498,19 @@ com melhorias ou declinio em seus indicadores.
 """)
 
 try:
-    transitions = get_cluster_transitions_potential()
+    promo = get_promo_candidates()
+    risk = get_risk_candidates()
 
-    if not transitions.is_empty():
+    if promo.num_rows or risk.num_rows:
         col1, col2 = st.columns(2)
 
         with col1:
             st.subheader("🚀 Potencial Promocao")
             st.caption("Municipios com IDHM acima da media do cluster")
 
-            promo = transitions.filter(
-                pl.col("status_transicao") == "Potencial Promocao"
-            ).head(20).to_pandas()
-
-            if len(promo) > 0:
+            if promo.num_rows > 0:
                 st.dataframe(
-                    promo[["nome_municipio", "sigla_uf", "cluster_label",
-                           "idhm_2010", "idhm_vs_cluster"]],
+                    promo,
                     use_container_width=True,
                     hide_index=True,
                     column_config={
@@ -391,14 +530,9 @@ try:
             st.subheader("⚠️ Risco Rebaixamento")
             st.caption("Municipios com IDHM abaixo da media do cluster")
 
-            risk = transitions.filter(
-                pl.col("status_transicao") == "Risco Rebaixamento"
-            ).head(20).to_pandas()
-
-            if len(risk) > 0:
+            if risk.num_rows > 0:
                 st.dataframe(
-                    risk[["nome_municipio", "sigla_uf", "cluster_label",
-                          "idhm_2010", "idhm_vs_cluster"]],
+                    risk,
                     use_container_width=True,
                     hide_index=True,
                     column_config={
@@ -421,40 +555,26 @@ except Exception:
 # =============================================================================
 # STATE DISTRIBUTION (Expandable)
 # =============================================================================
-with st.expander("📍 Distribuicao por Estado"):
-    try:
-        state_dist = get_cluster_distribution_by_state()
-
-        if not state_dist.is_empty():
-            df = state_dist.to_pandas()
-
-            # Filter by selected region if applicable
-            if selected_region != "All":
-                df = df[df["regiao"] == selected_region]
-
-            if len(df) > 0:
-                fig = px.bar(
-                    df,
-                    x="sigla_uf",
-                    y="count",
-                    color="cluster_label",
-                    color_discrete_sequence=[CLUSTER_COLORS[i] for i in range(5)],
-                    title="Distribuicao de Clusters por Estado",
-                    labels={
-                        "sigla_uf": "Estado",
-                        "count": "Municipios",
-                        "cluster_label": "Nivel"
-                    },
-                    barmode="stack"
-                )
-                fig.update_layout(
-                    xaxis_tickangle=-45,
-                    legend=dict(orientation="h", y=-0.25),
-                    height=500
-                )
-                st.plotly_chart(fig, use_container_width=True)
-    except Exception:
-        st.info("Dados por estado nao disponiveis.")
+
+
+@st.fragment
+def state_distribution(selected_region: str) -> None:
+    """State breakdown expander; toggling it does not rerun the rest of the page."""
+    with st.expander("📍 Distribuicao por Estado"):
+        # The expander body runs even when collapsed, so the chart is opt-in
+        if st.checkbox("Ver distribuicao por estado", key="state_dist_opened"):
+            try:
+                fig_json = build_state_stack_json(selected_region)
+
+                if fig_json is not None:
+                    st.plotly_chart(
+                        pio.from_json(fig_json), use_container_width=True, key="bar_state_stack"
+                    )
+            except Exception:
+                st.info("Dados por estado nao disponiveis.")
+
+
+state_distribution(selected_region)
 
 # =============================================================================
 # METHODOLOGY
@@ -509,7 +629,7 @@ with st.expander("📚 Metodologia de Clustering"):
     # 2. Carregar no dbt
     cd dbt_project
     dbt seed
-    dbt run --select mart_cluster_analysis
+    dbt run --select mart_cluster_analysis+
     ```
     """)
 
@@ -0,0 +1,34 @@
+{{
+    config(
+        materialized='table',
+        tags=['mart', 'analytics', 'clustering']
+    )
+}}
+
+/*
+    ==========================================================================
+    MART: CLUSTER PROMOTION CANDIDATES
+    ==========================================================================
+
+    Grain: One row per municipality (top 20 only)
+
+    The 20 municipalities with status_transicao = 'Potencial Promocao' that sit
+    furthest above their cluster mean IDHM. Precomputed so the dashboard reads the
+    list directly instead of filtering the full cluster mart on every request.
+
+    Data sources:
+    - mart_cluster_analysis: Cluster assignments and transition status
+*/
+
+select
+    id_municipio_ibge,
+    cluster_id,
+    nome_municipio,
+    sigla_uf,
+    cluster_label,
+    idhm_2010,
+    idhm_vs_cluster
+from {{ ref('mart_cluster_analysis') }}
+where status_transicao = 'Potencial Promocao'
+order by idhm_vs_cluster desc
+limit 20
@@ -0,0 +1,34 @@
+{{
+    config(
+        materialized='table',
+        tags=['mart', 'analytics', 'clustering']
+    )
+}}
+
+/*
+    ==========================================================================
+    MART: CLUSTER DEMOTION RISK CANDIDATES
+    ==========================================================================
+
+    Grain: One row per municipality (top 20 only)
+
+    The 20 municipalities with status_transicao = 'Risco Rebaixamento' that sit
+    furthest below their cluster mean IDHM. Precomputed so the dashboard reads the
+    list directly instead of filtering the full cluster mart on every request.
+
+    Data sources:
+    - mart_cluster_analysis: Cluster assignments and transition status
+*/
+
+select
+    id_municipio_ibge,
+    cluster_id,
+    nome_municipio,
+    sigla_uf,
+    cluster_label,
+    idhm_2010,
+    idhm_vs_cluster
+from {{ ref('mart_cluster_analysis') }}
+where status_transicao = 'Risco Rebaixamento'
+order by idhm_vs_cluster asc
+limit 20
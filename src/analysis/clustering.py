@@ -6,26 +6,44 @@ into development tiers based on socio-economic indicators.
 
 Usage:
     python -m src.analysis.clustering
+    CLUSTER_SWEEP=1 python -m src.analysis.clustering  # also run the k sweep
 
 Or from Python:
     from src.analysis.clustering import main
     df, profiles = main()
 """
 
+import hashlib
+import os
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 import duckdb
 import numpy as np
 import polars as pl
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from joblib import Parallel, delayed
+
+# Route KMeans/silhouette through oneDAL when scikit-learn-intelex is installed
+# (pip install -e ".[accel]"); must run before sklearn estimators are imported.
+try:
+    from sklearnex import patch_sklearn
+
+    patch_sklearn(verbose=False)
+except ImportError:
+    pass
+
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.metrics import silhouette_score
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 WAREHOUSE_PATH = PROJECT_ROOT / "data" / "warehouse" / "analytics.duckdb"
 SEED_OUTPUT_PATH = PROJECT_ROOT / "dbt_project" / "seeds" / "seed_cluster_assignments.csv"
+FEATURE_CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+CENTROIDS_PATH = PROJECT_ROOT / "data" / "warehouse" / "kmeans_centroids.npy"
+
+# Bump when the feature query changes so cached feature files are not reused
+FEATURE_VERSION = 2
 
 # Schema prefix
 MARTS_SCHEMA = "main_marts"
@@ -49,13 +67,52 @@ CLUSTERING_FEATURES = [
     "renda_per_capita_log",
 ]
 
+# Per-cluster summary statistics (avg_idhm also orders the clusters)
+PROFILE_AGGREGATIONS = [
+    pl.len().alias("num_municipios"),
+    pl.col("populacao").sum().alias("total_populacao"),
+    pl.col("idhm_2010").mean().alias("avg_idhm"),
+    pl.col("idhm_2010").std().alias("std_idhm"),
+    pl.col("idhm_2010").min().alias("min_idhm"),
+    pl.col("idhm_2010").max().alias("max_idhm"),
+    pl.col("ivs_2010").mean().alias("avg_ivs"),
+    pl.col("gini_2010").mean().alias("avg_gini"),
+    pl.col("renda_per_capita_2010").mean().alias("avg_renda_pc"),
+]
+
+# Silhouette is O(n^2); the k sweep scores a fixed random subsample instead
+SILHOUETTE_SAMPLE_SIZE = 1500
 
-def load_municipality_data() -> pl.DataFrame:
+
+def _feature_cache_path(conn: duckdb.DuckDBPyConnection) -> Path:
+    """Cache file for the current dim_municipio build and feature version."""
+    n_rows, loaded_at = conn.execute(
+        f"SELECT COUNT(*), MAX(_loaded_at) FROM {MARTS_SCHEMA}.dim_municipio"
+    ).fetchone()
+    key = hashlib.blake2b(
+        f"{n_rows}:{loaded_at}:{FEATURE_VERSION}".encode(), digest_size=8
+    ).hexdigest()
+    return FEATURE_CACHE_DIR / f"features_{key}.parquet"
+
+
+def load_municipality_data(use_cache: bool = True) -> pl.DataFrame:
     """
     Load municipality data from DuckDB warehouse.
 
+    Feature engineering runs in the same query: derived features are added
+    (IVS and Gini inverted so higher = better, income per capita log-scaled),
+    non-finite values are imputed with the column median, and every clustering
+    feature is z-scored into a ``<feature>_z`` column.
+
+    The result is cached as Parquet under data/cache, keyed by the row count
+    and load timestamp of dim_municipio, so re-runs against an unchanged
+    warehouse skip the query.
+
+    Args:
+        use_cache: Read/write the on-disk feature cache.
+
     Returns:
-        Polars DataFrame with municipality data and indicators.
+        Polars DataFrame with municipality data, indicators and scaled features.
 
     Raises:
         FileNotFoundError: If database file doesn't exist.
@@ -68,89 +125,120 @@ def load_municipality_data() -> pl.DataFrame:
 
     conn = duckdb.connect(str(WAREHOUSE_PATH), read_only=True)
 
+    cache_path = _feature_cache_path(conn) if use_cache else None
+    if cache_path is not None and cache_path.exists():
+        return pl.read_parquet(cache_path)
+
+    imputed = ",\n            ".join(
+        f"COALESCE(CASE WHEN isfinite({c}) THEN {c} END, "
+        f"MEDIAN(CASE WHEN isfinite({c}) THEN {c} END) OVER ()) AS {c}_imputed"
+        for c in CLUSTERING_FEATURES
+    )
+    # Population std (STDDEV_POP) to match sklearn's StandardScaler; emitted as
+    # FLOAT so the Arrow result is already the float32 matrix KMeans consumes
+    scaled = ",\n        ".join(
+        f"(({c}_imputed - AVG({c}_imputed) OVER ()) "
+        f"/ STDDEV_POP({c}_imputed) OVER ())::FLOAT AS {c}_z"
+        for c in CLUSTERING_FEATURES
+    )
+    imputed_cols = ", ".join(f"{c}_imputed" for c in CLUSTERING_FEATURES)
+
     query = f"""
+    WITH base AS (
+        SELECT
+            id_municipio_ibge,
+            nome_municipio,
+            sigla_uf,
+            regiao,
+            populacao,
+            porte_municipio,
+            idhm_2010,
+            idhm_educacao,
+            idhm_longevidade,
+            idhm_renda,
+            ivs_2010,
+            gini_2010,
+            renda_per_capita_2010,
+            -- Invert IVS (vulnerability) and Gini (inequality) so higher = better
+            1 - ivs_2010 AS ivs_2010_inverted,
+            1 - gini_2010 AS gini_2010_inverted,
+            -- Log-scale income per capita for better distribution
+            CASE WHEN renda_per_capita_2010 > 0 THEN ln(renda_per_capita_2010) END
+                AS renda_per_capita_log
+        FROM {MARTS_SCHEMA}.dim_municipio
+        WHERE idhm_2010 IS NOT NULL
+          AND ivs_2010 IS NOT NULL
+          AND gini_2010 IS NOT NULL
+          AND renda_per_capita_2010 IS NOT NULL
+    ),
+    imputed AS (
+        SELECT
+            *,
+            {imputed}
+        FROM base
+    )
     SELECT
-        id_municipio_ibge,
-        nome_municipio,
-        sigla_uf,
-        regiao,
-        populacao,
-        porte_municipio,
-        idhm_2010,
-        idhm_educacao,
-        idhm_longevidade,
-        idhm_renda,
-        ivs_2010,
-        gini_2010,
-        renda_per_capita_2010
-    FROM {MARTS_SCHEMA}.dim_municipio
-    WHERE idhm_2010 IS NOT NULL
-      AND ivs_2010 IS NOT NULL
-      AND gini_2010 IS NOT NULL
-      AND renda_per_capita_2010 IS NOT NULL
+        * EXCLUDE ({imputed_cols}),
+        {scaled}
+    FROM imputed
     """
 
-    return conn.execute(query).pl()
+    df = conn.execute(query).pl()
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df.write_parquet(cache_path)
+
+    return df
 
 
 def prepare_features(df: pl.DataFrame) -> Tuple[np.ndarray, pl.DataFrame]:
     """
-    Prepare and scale features for clustering.
+    Extract the scaled feature matrix for clustering.
 
-    Transforms raw indicators into normalized features:
-    - Inverts IVS and Gini so higher values = better
-    - Log-scales income per capita
-    - Standardizes all features
+    The features are derived, imputed and standardized in SQL by
+    load_municipality_data; this only pulls the ``<feature>_z`` columns
+    out as a NumPy matrix.
 
     Args:
-        df: DataFrame with municipality data.
+        df: DataFrame returned by load_municipality_data.
 
     Returns:
-        Tuple of (scaled feature matrix, enhanced DataFrame).
+        Tuple of (float32 scaled feature matrix, DataFrame without the scaled columns).
     """
-    # Create derived features
-    df = df.with_columns([
-        # Invert IVS (vulnerability) so higher = better
-        (1 - pl.col("ivs_2010")).alias("ivs_2010_inverted"),
-        # Invert Gini (inequality) so higher = better
-        (1 - pl.col("gini_2010")).alias("gini_2010_inverted"),
-        # Log-scale income per capita for better distribution
-        pl.col("renda_per_capita_2010").log().alias("renda_per_capita_log"),
-    ])
-
-    # Select feature columns
-    feature_cols = [
-        "idhm_2010",
-        "idhm_educacao",
-        "idhm_renda",
-        "ivs_2010_inverted",
-        "gini_2010_inverted",
-        "renda_per_capita_log",
-    ]
-
-    # Extract feature matrix
-    X = df.select(feature_cols).to_numpy()
-
-    # Handle any remaining NaN/inf values with column medians
-    for i in range(X.shape[1]):
-        col = X[:, i]
-        mask = ~np.isfinite(col)
-        if mask.any():
-            median_val = np.nanmedian(col[np.isfinite(col)])
-            X[mask, i] = median_val
-
-    # Standardize features (z-score normalization)
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    return X_scaled, df
+    scaled_cols = [f"{c}_z" for c in CLUSTERING_FEATURES]
+    # The _z columns arrive as Float32 from DuckDB, so this is a single copy
+    # of the Arrow buffers into the final C-contiguous matrix
+    X_scaled = df.select(scaled_cols).to_numpy(order="c")
+
+    return X_scaled, df.drop(scaled_cols)
+
+
+def _fit_one(
+    X: np.ndarray,
+    sample_idx: np.ndarray,
+    k: int,
+) -> Tuple[float, float]:
+    """Fit one k of the sweep and return its (inertia, sampled silhouette)."""
+    # Mini-batch fits: the sweep only needs the trend, not the best fit
+    kmeans = MiniBatchKMeans(
+        n_clusters=k,
+        random_state=42,
+        batch_size=1024,
+        n_init=3,
+        max_iter=100,
+    )
+    labels = kmeans.fit_predict(X)
+    return kmeans.inertia_, silhouette_score(X[sample_idx], labels[sample_idx])
 
 
 def find_optimal_clusters(X: np.ndarray, max_k: int = 10) -> dict:
     """
     Analyze clustering performance for different k values.
 
-    Uses elbow method (inertia) and silhouette score.
+    Uses elbow method (inertia) and silhouette score. Silhouette is computed
+    on the same random subsample for every k so the scores are comparable.
+    The k values are independent and fitted in parallel threads.
 
     Args:
         X: Scaled feature matrix.
@@ -159,20 +247,22 @@ def find_optimal_clusters(X: np.ndarray, max_k: int = 10) -> dict:
     Returns:
         Dictionary with analysis results and recommended k.
     """
-    inertias = []
-    silhouettes = []
+    rng = np.random.default_rng(42)
+    sample_size = min(SILHOUETTE_SAMPLE_SIZE, X.shape[0])
+    sample_idx = rng.choice(X.shape[0], size=sample_size, replace=False)
 
-    for k in range(2, max_k + 1):
-        kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(X)
-        inertias.append(kmeans.inertia_)
-        silhouettes.append(silhouette_score(X, labels))
+    k_range = list(range(2, max_k + 1))
+    results = Parallel(n_jobs=-1, prefer="threads")(
+        delayed(_fit_one)(X, sample_idx, k) for k in k_range
+    )
+    inertias = [inertia for inertia, _ in results]
+    silhouettes = [silhouette for _, silhouette in results]
 
     # Find optimal k by silhouette score
     best_k_silhouette = silhouettes.index(max(silhouettes)) + 2
 
     return {
-        "k_range": list(range(2, max_k + 1)),
+        "k_range": k_range,
         "inertias": inertias,
         "silhouettes": silhouettes,
         "best_k_silhouette": best_k_silhouette,
@@ -180,28 +270,64 @@ def find_optimal_clusters(X: np.ndarray, max_k: int = 10) -> dict:
     }
 
 
-def run_clustering(X: np.ndarray, n_clusters: int = 5) -> Tuple[np.ndarray, KMeans]:
+def run_clustering(
+    X: np.ndarray,
+    n_clusters: int = 5,
+    verbose: bool = True,
+    centroids_path: Optional[Path] = None,
+) -> Tuple[np.ndarray, KMeans]:
     """
     Run K-Means clustering.
 
+    The cluster structure is stable between data refreshes, so when
+    centroids_path is given the centroids of the previous run are saved there
+    and used as the single starting point of the next one. Without a usable
+    previous run, 10 k-means++ starts are used.
+
     Args:
         X: Scaled feature matrix.
         n_clusters: Number of clusters.
+        verbose: Report whether the fit was warm-started and print a
+            (subsampled) silhouette score.
+        centroids_path: Where previous centroids are read from and the new
+            ones saved. None (the default) disables warm starting, so results
+            don't depend on files left by earlier runs.
 
     Returns:
         Tuple of (cluster labels, fitted KMeans model).
     """
-    kmeans = KMeans(
-        n_clusters=n_clusters,
-        random_state=42,
-        n_init=10,
-        max_iter=300,
-    )
+    init = None
+    if centroids_path is not None and centroids_path.exists():
+        init = np.load(centroids_path)
+        if init.shape != (n_clusters, X.shape[1]):
+            init = None
+
+    if init is not None:
+        if verbose:
+            print(f"   Warm start from {centroids_path.name}")
+        kmeans = KMeans(n_clusters=n_clusters, init=init, n_init=1, max_iter=300)
+    else:
+        kmeans = KMeans(
+            n_clusters=n_clusters,
+            random_state=42,
+            n_init=10,
+            max_iter=300,
+        )
     labels = kmeans.fit_predict(X)
 
-    # Calculate silhouette score
-    score = silhouette_score(X, labels)
-    print(f"Silhouette Score: {score:.4f}")
+    if centroids_path is not None:
+        centroids_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(centroids_path, kmeans.cluster_centers_)
+
+    if verbose:
+        # Diagnostic only, so estimate it on a subsample
+        score = silhouette_score(
+            X,
+            labels,
+            sample_size=min(SILHOUETTE_SAMPLE_SIZE, X.shape[0]),
+            random_state=42,
+        )
+        print(f"Silhouette Score: {score:.4f}")
 
     return labels, kmeans
 
@@ -209,49 +335,54 @@ def run_clustering(X: np.ndarray, n_clusters: int = 5) -> Tuple[np.ndarray, KMea
 def order_clusters_by_development(
     df: pl.DataFrame,
     labels: np.ndarray,
-) -> pl.DataFrame:
+) -> Tuple[pl.DataFrame, pl.DataFrame]:
     """
     Reorder clusters from most to least developed based on mean IDHM.
 
     Ensures cluster 0 = most developed, cluster 4 = least developed.
+    The cluster profiles are aggregated in the same pass that finds the
+    ordering, so no second group-by over the municipalities is needed.
 
     Args:
         df: DataFrame with municipality data.
         labels: Raw cluster labels from K-Means.
 
     Returns:
-        DataFrame with ordered cluster assignments and labels.
+        Tuple of (DataFrame with ordered cluster assignments and labels,
+        cluster profiles as returned by generate_cluster_profiles).
     """
-    df = df.with_columns(pl.Series("cluster_raw", labels))
-
-    # Calculate mean IDHM per cluster
-    cluster_means = (
-        df.group_by("cluster_raw")
-        .agg(pl.col("idhm_2010").mean().alias("mean_idhm"))
-        .sort("mean_idhm", descending=True)
+    cluster_raw = pl.Series("cluster_raw", labels)
+
+    # Profile each raw cluster; mean IDHM gives the development order
+    raw_profiles = (
+        df.with_columns(cluster_raw)
+        .group_by("cluster_raw")
+        .agg(PROFILE_AGGREGATIONS)
+        .sort("avg_idhm", descending=True)
     )
 
-    # Create mapping from raw cluster to ordered cluster
+    # Create mappings from raw cluster to ordered cluster ID and label
     cluster_mapping = {
-        row["cluster_raw"]: idx
-        for idx, row in enumerate(cluster_means.iter_rows(named=True))
+        raw: idx for idx, raw in enumerate(raw_profiles["cluster_raw"].to_list())
+    }
+    label_mapping = {
+        raw: CLUSTER_LABELS.get(idx, "Desconhecido")
+        for raw, idx in cluster_mapping.items()
     }
 
-    # Apply mapping to create ordered cluster IDs
-    df = df.with_columns(
-        pl.col("cluster_raw")
-        .replace_strict(cluster_mapping, default=None)
-        .alias("cluster_id")
-    )
-
-    # Add Portuguese labels
     df = df.with_columns(
-        pl.col("cluster_id")
-        .replace_strict(CLUSTER_LABELS, default="Desconhecido")
-        .alias("cluster_label")
+        cluster_raw.replace_strict(cluster_mapping, default=None).alias("cluster_id"),
+        cluster_raw.replace_strict(label_mapping, default="Desconhecido")
+        .alias("cluster_label"),
     )
+    profiles = raw_profiles.select(
+        pl.col("cluster_raw").replace_strict(cluster_mapping, default=None).alias("cluster_id"),
+        pl.col("cluster_raw").replace_strict(label_mapping, default="Desconhecido")
+        .alias("cluster_label"),
+        pl.exclude("cluster_raw"),
+    ).sort("cluster_id")
 
-    return df.drop("cluster_raw")
+    return df, profiles
 
 
 def generate_cluster_profiles(df: pl.DataFrame) -> pl.DataFrame:
@@ -266,17 +397,7 @@ def generate_cluster_profiles(df: pl.DataFrame) -> pl.DataFrame:
     """
     return (
         df.group_by("cluster_id", "cluster_label")
-        .agg([
-            pl.len().alias("num_municipios"),
-            pl.col("populacao").sum().alias("total_populacao"),
-            pl.col("idhm_2010").mean().alias("avg_idhm"),
-            pl.col("idhm_2010").std().alias("std_idhm"),
-            pl.col("idhm_2010").min().alias("min_idhm"),
-            pl.col("idhm_2010").max().alias("max_idhm"),
-            pl.col("ivs_2010").mean().alias("avg_ivs"),
-            pl.col("gini_2010").mean().alias("avg_gini"),
-            pl.col("renda_per_capita_2010").mean().alias("avg_renda_pc"),
-        ])
+        .agg(PROFILE_AGGREGATIONS)
         .sort("cluster_id")
     )
 
@@ -306,10 +427,15 @@ def export_to_dbt_seed(df: pl.DataFrame) -> Path:
     return SEED_OUTPUT_PATH
 
 
-def main() -> Tuple[pl.DataFrame, pl.DataFrame]:
+def main(sweep: Optional[bool] = None) -> Tuple[pl.DataFrame, pl.DataFrame]:
     """
     Run the full clustering pipeline.
 
+    Args:
+        sweep: Run the k sweep (elbow/silhouette) before clustering. k is fixed
+            at 5, so this is diagnostic only. Defaults to the CLUSTER_SWEEP
+            environment variable ("1" enables it).
+
     Returns:
         Tuple of (municipality DataFrame with clusters, cluster profiles).
     """
@@ -325,33 +451,39 @@ def main() -> Tuple[pl.DataFrame, pl.DataFrame]:
     X_scaled, df = prepare_features(df)
     print(f"   Features: {CLUSTERING_FEATURES}")
 
-    print("\n3. Analyzing optimal cluster count...")
-    analysis = find_optimal_clusters(X_scaled)
-    print(f"   Best k by silhouette: {analysis['best_k_silhouette']}")
-    print(f"   Using k=5 for interpretability")
+    if sweep is None:
+        sweep = os.getenv("CLUSTER_SWEEP", "0") == "1"
 
-    print("\n4. Running K-Means clustering (k=5)...")
-    labels, kmeans = run_clustering(X_scaled, n_clusters=5)
+    if sweep:
+        print("\n3. Analyzing optimal cluster count...")
+        analysis = find_optimal_clusters(X_scaled)
+        print(f"   Best k by silhouette: {analysis['best_k_silhouette']}")
+        print(f"   Using k=5 for interpretability")
+    else:
+        print("\n3. Skipping k sweep (set CLUSTER_SWEEP=1 to enable)")
 
-    print("\n5. Ordering clusters by development level...")
-    df = order_clusters_by_development(df, labels)
+    print("\n4. Running K-Means clustering (k=5)...")
+    labels, kmeans = run_clustering(X_scaled, n_clusters=5, centroids_path=CENTROIDS_PATH)
 
-    print("\n6. Generating cluster profiles...")
-    profiles = generate_cluster_profiles(df)
+    print("\n5. Ordering clusters by development level and profiling...")
+    df, profiles = order_clusters_by_development(df, labels)
 
     print("\n" + "=" * 60)
     print("CLUSTER PROFILES")
     print("=" * 60)
-    for row in profiles.iter_rows(named=True):
+    for row in profiles.to_dicts():
         print(f"\n[Cluster {row['cluster_id']}] {row['cluster_label']}")
         print(f"   Municipios: {row['num_municipios']:,}")
         print(f"   Populacao: {row['total_populacao']:,.0f}")
-        print(f"   IDHM: {row['avg_idhm']:.3f} (range: {row['min_idhm']:.3f}-{row['max_idhm']:.3f})")
+        print(
+            f"   IDHM: {row['avg_idhm']:.3f} "
+            f"(range: {row['min_idhm']:.3f}-{row['max_idhm']:.3f})"
+        )
         print(f"   IVS: {row['avg_ivs']:.3f}")
         print(f"   Gini: {row['avg_gini']:.3f}")
         print(f"   Renda PC: R$ {row['avg_renda_pc']:,.2f}")
 
-    print("\n7. Exporting to dbt seed...")
+    print("\n6. Exporting to dbt seed...")
     seed_path = export_to_dbt_seed(df)
     print(f"   Saved to: {seed_path}")
 
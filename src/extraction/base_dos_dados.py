@@ -7,16 +7,51 @@ and exports to local Parquet files for the Bronze layer.
 
 from __future__ import annotations
 
+import json
 import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal, TypeVar, cast, overload
 
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 from loguru import logger
 
 if TYPE_CHECKING:
-    import pandas as pd
+    from google.cloud import bigquery, bigquery_storage
+else:
+    try:
+        # Imported once at module level so worker threads don't race on it
+        # (google-cloud-bigquery ships with basedosdados)
+        from google.cloud import bigquery
+    except ImportError:
+        bigquery = None
+
+    try:
+        # Optional: enables fast Arrow downloads through the BigQuery Storage API
+        from google.cloud import bigquery_storage
+    except ImportError:
+        bigquery_storage = None
+
+try:
+    from google.api_core import exceptions as google_exceptions
+
+    # BigQuery errors worth retrying: slot contention, backend hiccups, rate limits
+    TRANSIENT_ERRORS: tuple[type[Exception], ...] = (
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.TooManyRequests,
+    )
+except ImportError:
+    TRANSIENT_ERRORS = ()
+
+T = TypeVar("T")
 
 # Configure loguru
 logger.add(
@@ -26,10 +61,20 @@ logger.add(
     level="INFO",
 )
 
+# Bronze Parquet layout defaults: cheap zstd level, large dictionary-encoded row groups
+PARQUET_COMPRESSION_LEVEL = 3
+PARQUET_ROW_GROUP_SIZE = 500_000
+PARQUET_DATA_PAGE_SIZE = 1 << 20
+
+# Exponential backoff for transient BigQuery errors: 2s, 4s, 8s, ... capped at 60s
+MAX_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 2
+RETRY_MAX_WAIT_SECONDS = 60
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TableConfig:
-    """Configuration for a table to extract."""
+    """Configuration for a table to extract (immutable, so usable as a cache key)."""
 
     dataset: str
     table: str
@@ -46,7 +91,7 @@ class TableConfig:
 # =============================================================================
 # BASE TABLES - Core municipality data
 # =============================================================================
-BASE_TABLES: list[TableConfig] = [
+BASE_TABLES: tuple[TableConfig, ...] = (
     TableConfig(
         dataset="br_bd_diretorios_brasil",
         table="municipio",
@@ -71,12 +116,12 @@ BASE_TABLES: list[TableConfig] = [
         description="Human Development Index (IDHM) and 200+ indicators",
         output_name="idhm",  # Matches existing stg_idhm.sql
     ),
-]
+)
 
 # =============================================================================
 # ELECTORAL TABLES - Political data from TSE
 # =============================================================================
-ELECTORAL_TABLES: list[TableConfig] = [
+ELECTORAL_TABLES: tuple[TableConfig, ...] = (
     TableConfig(
         dataset="br_tse_eleicoes",
         table="resultados_candidato_municipio",
@@ -102,12 +147,12 @@ ELECTORAL_TABLES: list[TableConfig] = [
         table="partidos",
         description="Political parties registry - creation and extinction dates",
     ),
-]
+)
 
 # =============================================================================
 # FISCAL TABLES - Municipal finances from SICONFI
 # =============================================================================
-FISCAL_TABLES: list[TableConfig] = [
+FISCAL_TABLES: tuple[TableConfig, ...] = (
     TableConfig(
         dataset="br_me_siconfi",
         table="municipio_despesas_funcao",
@@ -118,12 +163,12 @@ FISCAL_TABLES: list[TableConfig] = [
         table="municipio_receitas_orcamentarias",
         description="Municipal revenues with transfer breakdown (2013-2023)",
     ),
-]
+)
 
 # =============================================================================
 # EDUCATION TABLES - Annual education metrics
 # =============================================================================
-EDUCATION_TABLES: list[TableConfig] = [
+EDUCATION_TABLES: tuple[TableConfig, ...] = (
     TableConfig(
         dataset="br_inep_ideb",
         table="municipio",
@@ -141,12 +186,12 @@ EDUCATION_TABLES: list[TableConfig] = [
         """,
         output_name="censo_escolar_municipio",
     ),
-]
+)
 
 # =============================================================================
 # HEALTH TABLES - Mortality and health indicators
 # =============================================================================
-HEALTH_TABLES: list[TableConfig] = [
+HEALTH_TABLES: tuple[TableConfig, ...] = (
     TableConfig(
         dataset="br_ms_sim",
         table="municipio_causa",
@@ -180,12 +225,12 @@ HEALTH_TABLES: list[TableConfig] = [
         """,
         output_name="nascimentos_municipio",  # Avoid conflict with other 'municipio' tables
     ),
-]
+)
 
 # =============================================================================
 # SOCIAL TRANSFER TABLES - Federal programs
 # =============================================================================
-SOCIAL_TABLES: list[TableConfig] = [
+SOCIAL_TABLES: tuple[TableConfig, ...] = (
     TableConfig(
         dataset="br_mds_bolsa_familia",
         table="municipio",
@@ -208,34 +253,34 @@ SOCIAL_TABLES: list[TableConfig] = [
         """,
         output_name="cadastro_unico_municipio",  # Avoid conflict
     ),
-]
+)
 
 # =============================================================================
 # INFRASTRUCTURE TABLES
 # =============================================================================
-INFRASTRUCTURE_TABLES: list[TableConfig] = [
+INFRASTRUCTURE_TABLES: tuple[TableConfig, ...] = (
     TableConfig(
         dataset="br_mdr_snis",
         table="municipio",
         description="Sanitation indicators (water, sewage, waste) - annual",
         output_name="saneamento_municipio",  # Descriptive name
     ),
-]
+)
 
 # =============================================================================
 # COMBINED TABLE LISTS
 # =============================================================================
 
 # Default tables (original set for backward compatibility)
-DEFAULT_TABLES: list[TableConfig] = (
+DEFAULT_TABLES: tuple[TableConfig, ...] = (
     BASE_TABLES +
-    [ELECTORAL_TABLES[0]] +  # Just the main election results
+    (ELECTORAL_TABLES[0],) +  # Just the main election results
     FISCAL_TABLES +
-    [INFRASTRUCTURE_TABLES[0]]
+    (INFRASTRUCTURE_TABLES[0],)
 )
 
 # Full political-economy analysis tables
-POLITICAL_ECONOMY_TABLES: list[TableConfig] = (
+POLITICAL_ECONOMY_TABLES: tuple[TableConfig, ...] = (
     BASE_TABLES +
     ELECTORAL_TABLES +
     FISCAL_TABLES +
@@ -246,7 +291,34 @@ POLITICAL_ECONOMY_TABLES: list[TableConfig] = (
 )
 
 # All available tables
-ALL_TABLES: list[TableConfig] = POLITICAL_ECONOMY_TABLES
+ALL_TABLES: tuple[TableConfig, ...] = POLITICAL_ECONOMY_TABLES
+
+
+@dataclass(slots=True, frozen=True)
+class _FooterInfo:
+    """Table metadata read from a Parquet footer (immutable, safe to cache)."""
+
+    rows: int
+    dtypes: tuple[tuple[str, str], ...]  # (column name, Arrow type) pairs
+    uncompressed_bytes: int
+
+
+@lru_cache(maxsize=128)
+def _footer_info(path: str, mtime_ns: int) -> _FooterInfo:
+    """
+    Row count, schema and uncompressed size from a Parquet footer.
+
+    No column data is read. Keyed on mtime so a re-extracted file is re-read.
+    """
+    pf = pq.ParquetFile(path)
+    meta = pf.metadata
+    return _FooterInfo(
+        rows=meta.num_rows,
+        dtypes=tuple((field.name, str(field.type)) for field in pf.schema_arrow),
+        uncompressed_bytes=sum(
+            meta.row_group(i).total_byte_size for i in range(meta.num_row_groups)
+        ),
+    )
 
 
 class BaseDadosExtractor:
@@ -268,6 +340,8 @@ class BaseDadosExtractor:
         self,
         billing_project: str | None = None,
         output_dir: Path | str = "data/raw",
+        compression_level: int = PARQUET_COMPRESSION_LEVEL,
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
     ) -> None:
         """
         Initialize the extractor.
@@ -276,6 +350,9 @@ class BaseDadosExtractor:
             billing_project: Google Cloud project ID for billing.
                             If None, reads from BASEDOSDADOS_BILLING_PROJECT_ID env var.
             output_dir: Directory to save Parquet files.
+            compression_level: zstd level for written Parquet files. Raise it
+                to trade write speed for smaller files.
+            row_group_size: Maximum rows per Parquet row group.
         """
         self.billing_project = billing_project or os.getenv(
             "BASEDOSDADOS_BILLING_PROJECT_ID"
@@ -288,110 +365,397 @@ class BaseDadosExtractor:
 
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
+
+        # BigQuery clients are created on first use and shared by all worker threads
+        self._client_lock = threading.Lock()
+        self._bq_client: bigquery.Client | None = None
+        self._bqstorage_client: bigquery_storage.BigQueryReadClient | None = None
 
-        logger.info(f"Initialized BaseDadosExtractor with project: {self.billing_project}")
-        logger.info(f"Output directory: {self.output_dir.absolute()}")
+        logger.info("Initialized BaseDadosExtractor with project: {}", self.billing_project)
+        logger.info("Output directory: {}", self.output_dir.absolute())
 
-    def _build_query(self, config: TableConfig) -> str:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _build_query(config: TableConfig) -> str:
         """Build the SQL query for extraction."""
         if config.query:
             return config.query
         return f"SELECT * FROM `basedosdados.{config.dataset}.{config.table}`"
 
+    @staticmethod
+    def _meta_path(output_path: Path) -> Path:
+        """Sidecar file recording how an extracted Parquet file was produced."""
+        return output_path.with_suffix(".meta.json")
+
+    def _is_fresh(self, config: TableConfig, output_path: Path) -> bool:
+        """
+        Check an existing extract against the source with a COUNT(*) query.
+
+        Returns False when there is no sidecar, the query changed, or the
+        source row count differs from the one recorded at extraction time.
+        The count is retried on transient BigQuery errors like the download.
+        """
+        meta_path = self._meta_path(output_path)
+        if not meta_path.exists():
+            return False
+
+        meta = json.loads(meta_path.read_text())
+        query = self._build_query(config)
+        if meta.get("query") != query:
+            return False
+
+        recorded_rows = meta.get("rows")
+        if recorded_rows is None:
+            return False
+
+        n_rows = self._with_retry(
+            f"row count for {config.filename}", lambda: self._count_rows(query)
+        )
+        return n_rows == int(recorded_rows)
+
+    def _count_rows(self, query: str) -> int:
+        """Count a query's source rows on BigQuery without downloading them."""
+        count_query = f"SELECT COUNT(*) AS n FROM ({query})"
+        if bigquery is None:
+            import basedosdados as bd
+
+            counts = bd.read_sql(count_query, billing_project_id=self.billing_project)
+            return int(counts["n"].iloc[0])
+
+        (n_rows,) = next(iter(self._run_query(count_query)))
+        return int(n_rows)
+
+    def _bigquery(self) -> bigquery.Client:
+        """Shared BigQuery client (auth and connection setup happen once)."""
+        with self._client_lock:
+            if self._bq_client is None:
+                self._bq_client = bigquery.Client(project=self.billing_project)
+            return self._bq_client
+
+    def _bigquery_storage(self) -> bigquery_storage.BigQueryReadClient:
+        """Shared BigQuery Storage read client."""
+        with self._client_lock:
+            if self._bqstorage_client is None:
+                self._bqstorage_client = bigquery_storage.BigQueryReadClient()
+            return self._bqstorage_client
+
+    def _run_query(self, query: str) -> bigquery.table.RowIterator:
+        """
+        Run a query on BigQuery and wait for its result.
+
+        Results are served from BigQuery's 24h query cache when the query
+        text and source tables are unchanged, which also makes reruns free.
+        """
+        job_config = bigquery.QueryJobConfig(use_query_cache=True)
+        return self._bigquery().query(query, job_config=job_config).result()
+
+    def _fetch_batches(self, query: str) -> Iterator[pa.RecordBatch]:
+        """
+        Run a query and stream the result as Arrow record batches.
+
+        Uses the BigQuery Storage API when available; otherwise falls back
+        to basedosdados, which materializes the whole result in pandas first.
+        An empty result yields a single zero-row batch carrying its schema.
+        """
+        if bigquery is not None and bigquery_storage is not None:
+            rows = self._run_query(query)
+            if rows.total_rows == 0:
+                # Nothing to stream; to_arrow() still builds the typed schema
+                yield pa.RecordBatch.from_pylist([], schema=rows.to_arrow().schema)
+                return
+            yield from rows.to_arrow_iterable(bqstorage_client=self._bigquery_storage())
+            return
+
+        import basedosdados as bd
+
+        logger.warning("google-cloud-bigquery-storage not installed, falling back to basedosdados")
+        df_pandas = bd.read_sql(query, billing_project_id=self.billing_project)
+        table = pa.Table.from_pandas(df_pandas, preserve_index=False, nthreads=os.cpu_count())
+        del df_pandas
+        if table.num_rows == 0:
+            yield pa.RecordBatch.from_pylist([], schema=table.schema)
+            return
+        yield from table.to_batches(max_chunksize=self.row_group_size)
+
+    def _write_parquet(self, batches: Iterable[pa.RecordBatch], output_path: Path) -> int:
+        """
+        Stream record batches to Parquet with the extractor's Bronze settings.
+
+        Batches are buffered up to one row group at a time, so peak memory is
+        bounded by row_group_size rather than the table size. The file is
+        written under a temporary name and only renamed into place once
+        complete, so a failed download never leaves a partial extract behind.
+
+        Returns:
+            Number of rows written.
+
+        Raises:
+            ValueError: If batches is empty. An empty result must still be
+                passed as a zero-row batch so the file keeps its schema.
+        """
+        tmp_path = output_path.with_suffix(".parquet.tmp")
+        writer: pq.ParquetWriter | None = None
+        schema: pa.Schema | None = None
+        pending: list[pa.RecordBatch] = []
+        pending_rows = rows = 0
+
+        try:
+            for batch in batches:
+                if writer is None:
+                    schema = batch.schema
+                    writer = pq.ParquetWriter(
+                        tmp_path,
+                        schema,
+                        compression="zstd",
+                        compression_level=self.compression_level,
+                        use_dictionary=True,
+                        write_statistics=True,
+                        data_page_size=PARQUET_DATA_PAGE_SIZE,
+                    )
+                pending.append(batch)
+                pending_rows += batch.num_rows
+
+                # Emit exactly row_group_size rows per group; the rest waits
+                # for the next batches so groups keep a fixed size
+                while pending_rows >= self.row_group_size:
+                    buffered = pa.Table.from_batches(pending, schema=schema)
+                    writer.write_table(
+                        buffered.slice(0, self.row_group_size),
+                        row_group_size=self.row_group_size,
+                    )
+                    rest = buffered.slice(self.row_group_size)
+                    pending, pending_rows = rest.to_batches(), rest.num_rows
+                    rows += self.row_group_size
+
+            if writer is None:
+                raise ValueError(f"No record batches to write to {output_path.name}")
+            # Last (possibly short) group; a zero-row result still writes its schema
+            if pending_rows or rows == 0:
+                writer.write_table(
+                    pa.Table.from_batches(pending, schema=schema),
+                    row_group_size=self.row_group_size,
+                )
+                rows += pending_rows
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        writer.close()
+        tmp_path.replace(output_path)
+        return rows
+
+    @staticmethod
+    def _with_retry(what: str, call: Callable[[], T]) -> T:
+        """Run a BigQuery call, retrying transient errors with exponential backoff."""
+        for attempt in range(1, MAX_ATTEMPTS):
+            try:
+                return call()
+            except TRANSIENT_ERRORS as e:
+                wait = min(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1), RETRY_MAX_WAIT_SECONDS)
+                logger.warning(
+                    "Transient error fetching {} (attempt {}/{}): {}. Retrying in {}s",
+                    what, attempt, MAX_ATTEMPTS, e, wait,
+                )
+                time.sleep(wait)
+        # Last attempt: let any error propagate
+        return call()
+
+    def _download(self, config: TableConfig, query: str, output_path: Path) -> int:
+        """Stream a query result to Parquet, retrying transient BigQuery errors with backoff."""
+        return self._with_retry(
+            config.filename,
+            lambda: self._write_parquet(self._fetch_batches(query), output_path),
+        )
+
     def extract_table(
         self,
         config: TableConfig,
         *,
         force: bool = False,
-    ) -> pl.DataFrame:
+        load: bool = True,
+        check_freshness: bool = False,
+        _existing: set[str] | None = None,
+    ) -> pl.DataFrame | pl.LazyFrame:
         """
         Extract a single table from BigQuery and save as Parquet.
 
         Args:
             config: Table configuration with dataset, table, and optional query.
             force: If True, re-extract even if file exists.
+            load: If False, return a lazy scan of the Parquet file instead of
+                reading it into memory.
+            check_freshness: If True, an existing file is only reused when a
+                COUNT(*) against the source matches the row count recorded in
+                its .meta.json sidecar.
+            _existing: Parquet filenames already known to be in output_dir
+                (used by extract_all to avoid a stat per table).
 
         Returns:
-            Polars DataFrame with the extracted data.
+            Polars DataFrame with the extracted data, or a LazyFrame over the
+            Parquet file when load=False.
         """
         output_path = self.output_dir / f"{config.filename}.parquet"
 
         # Check if file already exists
-        if output_path.exists() and not force:
-            logger.info(f"Skipping {config.filename} - file already exists. Use force=True to re-extract.")
-            return pl.read_parquet(output_path)
-
-        logger.info(f"Extracting: {config.dataset}.{config.table}")
-        logger.info(f"Description: {config.description}")
+        exists = output_path.name in _existing if _existing is not None else output_path.exists()
+        if exists and not force:
+            if check_freshness and not self._is_fresh(config, output_path):
+                logger.info("{} is stale - re-extracting.", config.filename)
+            else:
+                logger.info(
+                    "Skipping {} - file already exists. Use force=True to re-extract.",
+                    config.filename,
+                )
+                return pl.read_parquet(output_path) if load else pl.scan_parquet(output_path)
+
+        logger.info("Extracting: {}.{}", config.dataset, config.table)
+        logger.info("Description: {}", config.description)
 
         try:
-            # Import basedosdados here to avoid import errors if not installed
-            import basedosdados as bd
-
             query = self._build_query(config)
-            logger.debug(f"Query: {query[:200]}...")
-
-            # Execute query and get pandas DataFrame
-            df_pandas: pd.DataFrame = bd.read_sql(
-                query,
-                billing_project_id=self.billing_project,
+            logger.opt(lazy=True).debug("Query: {}...", lambda: query[:200])
+
+            # Stream results as Arrow batches straight into the Parquet file
+            rows = self._download(config, query, output_path)
+            self._meta_path(output_path).write_text(json.dumps({
+                "rows": rows,
+                "query": query,
+                "extracted_at": time.time(),
+            }))
+
+            logger.opt(lazy=True).success(
+                "Saved {}.parquet: {:,} rows, {:.2f} MB on disk",
+                lambda: config.filename,
+                lambda: rows,
+                lambda: output_path.stat().st_size / 1024 / 1024,
             )
 
-            # Convert to Polars for better performance
-            df = pl.from_pandas(df_pandas)
-
-            # Save as Parquet
-            df.write_parquet(output_path, compression="zstd")
-
-            logger.success(
-                f"Saved {config.filename}.parquet: {len(df):,} rows, "
-                f"{df.estimated_size() / 1024 / 1024:.2f} MB"
-            )
-
-            return df
+            return pl.read_parquet(output_path) if load else pl.scan_parquet(output_path)
 
         except ImportError:
             logger.error(
-                "basedosdados package not installed. "
+                "Neither google-cloud-bigquery-storage nor basedosdados is installed. "
                 "Install with: pip install basedosdados"
             )
             raise
         except Exception as e:
-            logger.error(f"Failed to extract {config.table}: {e}")
+            logger.error("Failed to extract {}: {}", config.filename, e)
             raise
 
+    @overload
+    def extract_all(
+        self,
+        tables: Sequence[TableConfig] | None = None,
+        *,
+        force: bool = False,
+        load: bool = False,
+        check_freshness: bool = False,
+        collect: Literal[True] = True,
+    ) -> dict[str, pl.DataFrame | pl.LazyFrame]: ...
+
+    @overload
     def extract_all(
         self,
-        tables: list[TableConfig] | None = None,
+        tables: Sequence[TableConfig] | None = None,
         *,
         force: bool = False,
-    ) -> dict[str, pl.DataFrame]:
+        load: bool = False,
+        check_freshness: bool = False,
+        collect: Literal[False],
+    ) -> dict[str, Path]: ...
+
+    def extract_all(
+        self,
+        tables: Sequence[TableConfig] | None = None,
+        *,
+        force: bool = False,
+        load: bool = False,
+        check_freshness: bool = False,
+        collect: bool = True,
+    ) -> dict[str, pl.DataFrame | pl.LazyFrame] | dict[str, Path]:
         """
         Extract all configured tables.
 
+        Tables are independent and network-bound, so they are extracted
+        concurrently in a small thread pool.
+
         Args:
-            tables: List of table configurations. If None, uses DEFAULT_TABLES.
+            tables: Table configurations. If None, uses DEFAULT_TABLES.
             force: If True, re-extract all tables even if files exist.
+            load: If True, read extracted tables into memory; otherwise they
+                are returned as lazy scans.
+            check_freshness: If True, re-extract existing tables whose source
+                row count changed (see extract_table).
+            collect: If False, only the Parquet files are produced and the
+                result maps filenames to file paths, so nothing is kept in
+                memory (load is ignored).
 
         Returns:
-            Dictionary mapping table names to DataFrames.
+            Dictionary mapping output filenames (see TableConfig.filename) to
+            DataFrames (or LazyFrames), or to Parquet paths when collect=False.
         """
         tables = tables or DEFAULT_TABLES
-        results: dict[str, pl.DataFrame] = {}
-
-        logger.info(f"Starting extraction of {len(tables)} tables...")
-
-        for i, config in enumerate(tables, 1):
-            logger.info(f"[{i}/{len(tables)}] Processing {config.table}")
-            try:
-                df = self.extract_table(config, force=force)
-                results[config.table] = df
-            except Exception as e:
-                logger.error(f"Failed to extract {config.table}: {e}")
-                # Continue with other tables
-                continue
-
-        logger.success(f"Extraction complete. {len(results)}/{len(tables)} tables extracted.")
+        frames: dict[str, pl.DataFrame | pl.LazyFrame] = {}
+        paths: dict[str, Path] = {}
+
+        # One directory listing instead of a stat per table
+        existing = {
+            entry.name
+            for entry in os.scandir(self.output_dir)
+            if entry.is_file() and entry.name.endswith(".parquet")
+        }
+        needed = [
+            config for config in tables
+            if force or check_freshness or f"{config.filename}.parquet" not in existing
+        ]
+
+        # Nothing to extract or load: skip the thread pool entirely
+        if not needed and not (load and collect):
+            logger.info(
+                "All {} tables already extracted. Use force=True to re-extract.", len(tables)
+            )
+            for config in tables:
+                path = self.output_dir / f"{config.filename}.parquet"
+                if collect:
+                    frames[config.filename] = pl.scan_parquet(path)
+                else:
+                    paths[config.filename] = path
+            return frames if collect else paths
+
+        logger.info("Starting extraction of {} tables...", len(tables))
+
+        with ThreadPoolExecutor(max_workers=min(8, len(tables))) as executor:
+            futures = {
+                executor.submit(
+                    self.extract_table,
+                    config,
+                    force=force,
+                    load=load and collect,
+                    check_freshness=check_freshness,
+                    _existing=existing,
+                ): config
+                for config in tables
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                config = futures[future]
+                try:
+                    frame = future.result()
+                    if collect:
+                        frames[config.filename] = frame
+                    else:
+                        paths[config.filename] = self.output_dir / f"{config.filename}.parquet"
+                    logger.info("[{}/{}] Finished {}", i, len(tables), config.filename)
+                except Exception as e:
+                    logger.error("Failed to extract {}: {}", config.filename, e)
+                    # Continue with other tables
+                    continue
+
+        results = frames if collect else paths
+        logger.success("Extraction complete. {}/{} tables extracted.", len(results), len(tables))
         return results
 
     def get_table_info(self, table_name: str) -> dict:
@@ -408,22 +772,32 @@ class BaseDadosExtractor:
         if not path.exists():
             raise FileNotFoundError(f"Table not found: {path}")
 
-        df = pl.read_parquet(path)
+        stat = path.stat()
+        footer = _footer_info(str(path), stat.st_mtime_ns)
         return {
             "table_name": table_name,
             "path": str(path),
-            "rows": len(df),
-            "columns": len(df.columns),
-            "column_names": df.columns,
-            "dtypes": {col: str(dtype) for col, dtype in zip(df.columns, df.dtypes)},
-            "size_mb": path.stat().st_size / 1024 / 1024,
-            "estimated_memory_mb": df.estimated_size() / 1024 / 1024,
+            "rows": footer.rows,
+            "columns": len(footer.dtypes),
+            "column_names": [name for name, _ in footer.dtypes],
+            "dtypes": dict(footer.dtypes),
+            "size_mb": stat.st_size / 1024 / 1024,
+            "estimated_memory_mb": footer.uncompressed_bytes / 1024 / 1024,
         }
 
     def list_extracted_tables(self) -> list[str]:
         """List all extracted Parquet files."""
         return [p.stem for p in self.output_dir.glob("*.parquet")]
 
+    def list_table_infos(self) -> list[dict]:
+        """
+        Get information about every extracted table.
+
+        Footers are read concurrently; see get_table_info for the fields.
+        """
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(self.get_table_info, self.list_extracted_tables()))
+
 
 def extract_political_economy(
     billing_project: str | None = None,
@@ -448,13 +822,20 @@ def extract_political_economy(
         force: If True, re-extract all tables even if files exist.
 
     Returns:
-        Dictionary mapping table names to DataFrames.
+        Dictionary mapping output filenames (TableConfig.filename, e.g.
+        "populacao", "idhm", "ideb_municipio") to DataFrames. Results used to
+        be keyed by source table name, which collided for the many
+        "municipio" tables; index by filename instead. Pipelines that only
+        need the files on disk should call BaseDadosExtractor.extract_all
+        with collect=False instead.
     """
     extractor = BaseDadosExtractor(
         billing_project=billing_project,
         output_dir=output_dir,
     )
-    return extractor.extract_all(tables=POLITICAL_ECONOMY_TABLES, force=force)
+    results = extractor.extract_all(tables=POLITICAL_ECONOMY_TABLES, force=force, load=True)
+    # load=True reads every table eagerly, so no LazyFrames are returned
+    return cast(dict[str, pl.DataFrame], results)
 
 
 def main() -> None:
@@ -470,13 +851,21 @@ def main() -> None:
         "--mode",
         choices=["default", "political-economy", "all"],
         default="default",
-        help="Extraction mode: default (basic tables), political-economy (full analysis), all (everything)",
+        help=(
+            "Extraction mode: default (basic tables), "
+            "political-economy (full analysis), all (everything)"
+        ),
     )
     parser.add_argument(
         "--force",
         action="store_true",
         help="Force re-extraction even if files exist",
     )
+    parser.add_argument(
+        "--check-freshness",
+        action="store_true",
+        help="Re-extract existing files whose source row count changed",
+    )
     args = parser.parse_args()
 
     # Select tables based on mode
@@ -494,16 +883,19 @@ def main() -> None:
     extractor = BaseDadosExtractor()
 
     # Extract tables
-    extractor.extract_all(tables=tables, force=args.force)
+    extractor.extract_all(
+        tables=tables,
+        force=args.force,
+        check_freshness=args.check_freshness,
+        collect=False,
+    )
 
     # Print summary
     logger.info("\n=== Extraction Summary ===")
-    for table_name in extractor.list_extracted_tables():
-        info = extractor.get_table_info(table_name)
+    for info in extractor.list_table_infos():
         logger.info(
-            f"{table_name}: {info['rows']:,} rows, "
-            f"{info['columns']} columns, "
-            f"{info['size_mb']:.2f} MB"
+            "{}: {:,} rows, {} columns, {:.2f} MB",
+            info["table_name"], info["rows"], info["columns"], info["size_mb"],
         )
 
 
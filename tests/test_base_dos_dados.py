@@ -0,0 +1,247 @@
+"""Tests for the Base dos Dados extractor's Parquet writer, retry loop and freshness check."""
+
+import json
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.extraction import base_dos_dados
+from src.extraction.base_dos_dados import BaseDadosExtractor, TableConfig
+
+
+@pytest.fixture
+def extractor(tmp_path: Path) -> BaseDadosExtractor:
+    return BaseDadosExtractor(
+        billing_project="test-project",
+        output_dir=tmp_path,
+        row_group_size=4,
+    )
+
+
+def _batch(start: int, n: int) -> pa.RecordBatch:
+    return pa.record_batch({"id": list(range(start, start + n)), "uf": ["SP"] * n})
+
+
+class TestWriteParquet:
+    def test_multiple_batches_are_written_in_bounded_row_groups(
+        self, extractor: BaseDadosExtractor, tmp_path: Path
+    ) -> None:
+        output_path = tmp_path / "tabela.parquet"
+        batches = [_batch(0, 3), _batch(3, 3), _batch(6, 3)]
+
+        rows = extractor._write_parquet(iter(batches), output_path)
+
+        meta = pq.ParquetFile(output_path).metadata
+        assert rows == 9
+        assert meta.num_rows == 9
+        assert meta.num_row_groups > 1
+        assert all(meta.row_group(i).num_rows <= 4 for i in range(meta.num_row_groups))
+        assert pq.read_table(output_path).column("id").to_pylist() == list(range(9))
+        assert not output_path.with_suffix(".parquet.tmp").exists()
+
+    def test_row_groups_have_a_fixed_size_when_batches_do_not_divide_it(
+        self, extractor: BaseDadosExtractor, tmp_path: Path
+    ) -> None:
+        output_path = tmp_path / "tabela.parquet"
+        batches = [_batch(0, 3), _batch(3, 5), _batch(8, 1), _batch(9, 6)]
+
+        rows = extractor._write_parquet(iter(batches), output_path)
+
+        meta = pq.ParquetFile(output_path).metadata
+        sizes = [meta.row_group(i).num_rows for i in range(meta.num_row_groups)]
+        assert rows == 15
+        assert sizes[:-1] == [4] * (len(sizes) - 1)
+        assert sizes == [4, 4, 4, 3]
+        assert pq.read_table(output_path).column("id").to_pylist() == list(range(15))
+
+    def test_zero_row_batch_keeps_schema(
+        self, extractor: BaseDadosExtractor, tmp_path: Path
+    ) -> None:
+        output_path = tmp_path / "vazia.parquet"
+        schema = pa.schema([("id", pa.int64()), ("uf", pa.string())])
+
+        rows = extractor._write_parquet(
+            iter([pa.RecordBatch.from_pylist([], schema=schema)]), output_path
+        )
+
+        table = pq.read_table(output_path)
+        assert rows == 0
+        assert table.num_rows == 0
+        assert table.schema.equals(schema)
+
+    def test_no_batches_raises_without_leaving_files(
+        self, extractor: BaseDadosExtractor, tmp_path: Path
+    ) -> None:
+        output_path = tmp_path / "nada.parquet"
+
+        with pytest.raises(ValueError):
+            extractor._write_parquet(iter([]), output_path)
+
+        assert not output_path.exists()
+        assert not output_path.with_suffix(".parquet.tmp").exists()
+
+    def test_error_mid_stream_removes_tmp_file(
+        self, extractor: BaseDadosExtractor, tmp_path: Path
+    ) -> None:
+        output_path = tmp_path / "parcial.parquet"
+
+        def failing_batches():
+            yield _batch(0, 5)
+            raise RuntimeError("connection reset")
+
+        with pytest.raises(RuntimeError, match="connection reset"):
+            extractor._write_parquet(failing_batches(), output_path)
+
+        assert not output_path.exists()
+        assert not output_path.with_suffix(".parquet.tmp").exists()
+
+
+class FakeBigQuery:
+    """Stands in for the BigQuery download: raises queued errors, then returns rows."""
+
+    def __init__(self, errors: list[Exception]) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def fetch_batches(self, query: str):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        yield _batch(0, 3)
+
+
+class TestDownloadRetry:
+    config = TableConfig(dataset="br_teste", table="municipio", description="test")
+
+    @pytest.fixture
+    def google_exceptions(self):
+        return pytest.importorskip("google.api_core.exceptions")
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        waits: list[float] = []
+        monkeypatch.setattr(base_dos_dados.time, "sleep", waits.append)
+        return waits
+
+    def _download(
+        self, extractor: BaseDadosExtractor, fake: FakeBigQuery, tmp_path: Path
+    ) -> int:
+        extractor._fetch_batches = fake.fetch_batches
+        return extractor._download(self.config, "SELECT 1", tmp_path / "municipio.parquet")
+
+    def test_transient_errors_back_off_exponentially(
+        self, extractor, tmp_path, google_exceptions, sleeps
+    ) -> None:
+        fake = FakeBigQuery([google_exceptions.ServiceUnavailable("busy")] * 4)
+
+        rows = self._download(extractor, fake, tmp_path)
+
+        assert rows == 3
+        assert fake.calls == 5
+        assert sleeps == [2, 4, 8, 16]
+
+    def test_backoff_is_capped(
+        self, extractor, tmp_path, google_exceptions, sleeps, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(base_dos_dados, "MAX_ATTEMPTS", 8)
+        fake = FakeBigQuery([google_exceptions.InternalServerError("oops")] * 7)
+
+        self._download(extractor, fake, tmp_path)
+
+        assert sleeps == [2, 4, 8, 16, 32, 60, 60]
+
+    def test_non_transient_error_is_raised_immediately(
+        self, extractor, tmp_path, google_exceptions, sleeps
+    ) -> None:
+        fake = FakeBigQuery([google_exceptions.BadRequest("syntax error")])
+
+        with pytest.raises(google_exceptions.BadRequest):
+            self._download(extractor, fake, tmp_path)
+
+        assert fake.calls == 1
+        assert sleeps == []
+
+    def test_last_error_is_raised_after_final_attempt(
+        self, extractor, tmp_path, google_exceptions, sleeps
+    ) -> None:
+        errors = [
+            google_exceptions.TooManyRequests(f"attempt {i}")
+            for i in range(1, base_dos_dados.MAX_ATTEMPTS + 1)
+        ]
+        fake = FakeBigQuery(errors)
+
+        with pytest.raises(google_exceptions.TooManyRequests, match="attempt 5"):
+            self._download(extractor, fake, tmp_path)
+
+        assert fake.calls == base_dos_dados.MAX_ATTEMPTS
+        assert len(sleeps) == base_dos_dados.MAX_ATTEMPTS - 1
+        assert not (tmp_path / "municipio.parquet").exists()
+
+
+class TestIsFresh:
+    config = TableConfig(dataset="br_teste", table="municipio", description="test")
+
+    def _write_sidecar(
+        self, extractor: BaseDadosExtractor, output_path: Path, *, rows: int, query: str
+    ) -> None:
+        extractor._meta_path(output_path).write_text(
+            json.dumps({"rows": rows, "query": query, "extracted_at": 0})
+        )
+
+    def test_matching_count_is_fresh(self, extractor, tmp_path, monkeypatch) -> None:
+        output_path = tmp_path / "municipio.parquet"
+        self._write_sidecar(
+            extractor, output_path, rows=10, query=extractor._build_query(self.config)
+        )
+        monkeypatch.setattr(extractor, "_count_rows", lambda query: 10)
+
+        assert extractor._is_fresh(self.config, output_path)
+
+    def test_changed_source_count_is_stale(self, extractor, tmp_path, monkeypatch) -> None:
+        output_path = tmp_path / "municipio.parquet"
+        self._write_sidecar(
+            extractor, output_path, rows=10, query=extractor._build_query(self.config)
+        )
+        monkeypatch.setattr(extractor, "_count_rows", lambda query: 12)
+
+        assert not extractor._is_fresh(self.config, output_path)
+
+    def test_changed_query_is_stale_without_counting(
+        self, extractor, tmp_path, monkeypatch
+    ) -> None:
+        output_path = tmp_path / "municipio.parquet"
+        self._write_sidecar(extractor, output_path, rows=10, query="SELECT 1")
+
+        def fail(query: str) -> int:
+            raise AssertionError("count should not run when the query changed")
+
+        monkeypatch.setattr(extractor, "_count_rows", fail)
+
+        assert not extractor._is_fresh(self.config, output_path)
+
+    def test_missing_sidecar_is_stale(self, extractor, tmp_path) -> None:
+        assert not extractor._is_fresh(self.config, tmp_path / "municipio.parquet")
+
+    def test_transient_count_error_is_retried(
+        self, extractor, tmp_path, monkeypatch
+    ) -> None:
+        google_exceptions = pytest.importorskip("google.api_core.exceptions")
+        monkeypatch.setattr(base_dos_dados.time, "sleep", lambda seconds: None)
+        output_path = tmp_path / "municipio.parquet"
+        self._write_sidecar(
+            extractor, output_path, rows=10, query=extractor._build_query(self.config)
+        )
+        responses: list[Exception | int] = [google_exceptions.ServiceUnavailable("busy"), 10]
+
+        def count(query: str) -> int:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        monkeypatch.setattr(extractor, "_count_rows", count)
+
+        assert extractor._is_fresh(self.config, output_path)
+        assert responses == []